@@ -2,15 +2,15 @@
 app.py
 Central application assembler for Phoenix Warm-Up Engine.
 Instantiates all stores, engines, scheduler, and the dashboard.
-Wires them together via a shared queue.Queue for thread-safe UI updates.
+Wires them together via a shared UIEventQueue for thread-safe UI updates.
 """
-import queue
 import sys
 from pathlib import Path
 
 from storage.inbox_store import InboxStore
 from storage.recipient_store import RecipientStore
 from storage.log_store import LogStore
+from core.ui_events import UIEventQueue
 from core.warmup_engine import WarmupEngine
 from core.reply_engine import ReplyEngine
 from scheduler import WarmupScheduler
@@ -28,8 +28,9 @@ class App:
         self.data_dir = data_dir
         self.assets_dir = assets_dir
 
-        # Thread-safe event queue: background threads → UI main thread
-        self.ui_queue: queue.Queue = queue.Queue(maxsize=1000)
+        # Thread-safe event buffer: background threads → UI main thread.
+        # Bounded ring — overflow drops oldest, so producers never block.
+        self.ui_queue = UIEventQueue(maxlen=512)
 
         # ── Storage Layer ──────────────────────────────────────────────── #
         self.inbox_store = InboxStore()
@@ -72,6 +73,10 @@ class App:
             assets_dir=self.assets_dir,
         )
 
+        # The dashboard is polling now — let the engines post UI events.
+        self.warmup_engine.ui_queue_enabled = True
+        self.reply_engine.ui_queue_enabled = True
+
     def _seed_recipients(self) -> None:
         """Generate initial pool of fake recipients on first startup."""
         try:
@@ -1,280 +1,359 @@
-"""
-core/content_generator.py
-Generates human-like email content using Faker for subject and body variation.
-No links, no HTML tags in plain text. No fixed patterns.
-"""
-import random
-from dataclasses import dataclass
-from typing import Optional
-
-try:
-    from faker import Faker
-    _faker = Faker("en_US")
-    _FAKER_AVAILABLE = True
-except ImportError:
-    _faker = None
-    _FAKER_AVAILABLE = False
-
-
-# ── Subject line templates ─────────────────────────────────────────────────── #
-
-SUBJECT_TEMPLATES = [
-    "Following up on {topic}",
-    "Quick question about {topic}",
-    "Checking in about {topic}",
-    "Thoughts on {topic}?",
-    "Re: {topic} update",
-    "{topic} - a quick note",
-    "Regarding {topic}",
-    "Quick note on {topic}",
-    "Update on {topic}",
-    "{topic} - wanted to share something",
-    "Just checking in on {topic}",
-    "A thought about {topic}",
-    "Circling back on {topic}",
-    "Any progress on {topic}?",
-    "About {topic}",
-]
-
-TOPICS = [
-    "the project timeline",
-    "our last discussion",
-    "the upcoming meeting",
-    "the proposal",
-    "Q4 planning",
-    "the draft document",
-    "the deliverables",
-    "the partnership",
-    "your recent feedback",
-    "the budget review",
-    "the resource allocation",
-    "the strategy session",
-    "the client presentation",
-    "the workflow improvements",
-    "the team update",
-    "the quarterly goals",
-    "the onboarding process",
-    "the pending review",
-]
-
-# ── Opening lines ──────────────────────────────────────────────────────────── #
-
-OPENERS = [
-    "Hope you're doing well.",
-    "Thanks for your time earlier.",
-    "Just following up as promised.",
-    "Wanted to check in quickly.",
-    "Hope this finds you well.",
-    "Hope your week is going well.",
-    "Thanks for getting back to me.",
-    "Just a quick note.",
-    "I hope things are going smoothly on your end.",
-    "Circling back on this.",
-    "Wanted to reach out quickly.",
-    "Hope you had a good weekend.",
-]
-
-# ── Body paragraph starters ────────────────────────────────────────────────── #
-
-PARA_STARTERS = [
-    "I wanted to touch base regarding",
-    "I've been thinking about",
-    "Just wanted to let you know that",
-    "Following our last conversation,",
-    "I had a few thoughts about",
-    "Wanted to share a quick update on",
-    "I came across something relevant to",
-    "As we discussed,",
-    "Building on what we talked about,",
-    "I wanted to get your perspective on",
-]
-
-# ── Closing lines ──────────────────────────────────────────────────────────── #
-
-CLOSERS = [
-    "Let me know your thoughts.",
-    "Looking forward to hearing from you.",
-    "Happy to discuss further if helpful.",
-    "Please let me know if you have any questions.",
-    "Feel free to reach out anytime.",
-    "Let me know if there's anything I can help with.",
-    "Happy to hop on a call if needed.",
-    "Let me know how you'd like to proceed.",
-    "Looking forward to your response.",
-    "Let me know what works best for you.",
-]
-
-SIGN_OFFS = [
-    "Best regards,",
-    "Best,",
-    "Thanks,",
-    "Warm regards,",
-    "Kind regards,",
-    "Regards,",
-    "Many thanks,",
-    "Cheers,",
-]
-
-
-@dataclass
-class GeneratedContent:
-    subject: str
-    body: str           # Plain text, no HTML, no links
-
-
-def _random_sentence() -> str:
-    """Return a random human-sounding sentence."""
-    if _FAKER_AVAILABLE:
-        return _faker.sentence(nb_words=random.randint(8, 18))
-    # Fallback if Faker not available
-    fallbacks = [
-        "I wanted to make sure we're aligned on the next steps.",
-        "There are a few things I'd like your input on.",
-        "Let me know if the timeline still works for you.",
-        "I've reviewed the materials and have some thoughts.",
-        "We may need to revisit a few of the assumptions.",
-    ]
-    return random.choice(fallbacks)
-
-
-def _random_name() -> str:
-    """Return a random first name."""
-    if _FAKER_AVAILABLE:
-        return _faker.first_name()
-    return random.choice(["Alex", "Jordan", "Sam", "Morgan", "Taylor", "Riley"])
-
-
-def generate_subject() -> str:
-    """Generate a natural-sounding email subject."""
-    template = random.choice(SUBJECT_TEMPLATES)
-    topic = random.choice(TOPICS)
-    return template.format(topic=topic)
-
-
-def generate_body(
-    sender_name: str,
-    recipient_name: str = "",
-    word_count_range: tuple = (80, 250),
-) -> str:
-    """
-    Generate a human-like plain-text email body.
-    No links, no HTML, no fixed patterns.
-    """
-    greeting_name = recipient_name.split()[0] if recipient_name else _random_name()
-    opener = random.choice(OPENERS)
-    sign_off = random.choice(SIGN_OFFS)
-
-    # Build paragraphs
-    target_words = random.randint(*word_count_range)
-    paragraphs = []
-    current_words = 0
-
-    while current_words < target_words:
-        starter = random.choice(PARA_STARTERS)
-        topic = random.choice(TOPICS)
-        sentences = [f"{starter} {topic}."]
-        for _ in range(random.randint(1, 3)):
-            sentences.append(_random_sentence())
-        para = " ".join(sentences)
-        paragraphs.append(para)
-        current_words += len(para.split())
-
-    closer = random.choice(CLOSERS)
-
-    lines = [
-        f"Hi {greeting_name},",
-        "",
-        opener,
-        "",
-    ]
-
-    for para in paragraphs[:3]:  # max 3 body paragraphs
-        lines.append(para)
-        lines.append("")
-
-    lines.extend([
-        closer,
-        "",
-        sign_off,
-        sender_name,
-    ])
-
-    return "\n".join(lines)
-
-
-def generate_reply_body(
-    sender_name: str,
-    recipient_name: str,
-    original_subject: str,
-    original_body_snippet: str = "",
-) -> str:
-    """
-    Generate a brief, natural reply to an email.
-    Quotes a small snippet of the original.
-    """
-    greeting_name = recipient_name.split()[0] if recipient_name else _random_name()
-    opener = random.choice([
-        "Thanks for reaching out.",
-        "Thanks for the update.",
-        "Appreciate you getting back to me.",
-        "Thanks for the note.",
-        "Good to hear from you.",
-    ])
-    sign_off = random.choice(SIGN_OFFS)
-
-    # Short reply body (2-3 sentences)
-    body_sentences = [_random_sentence() for _ in range(random.randint(1, 3))]
-    body = " ".join(body_sentences)
-
-    closer = random.choice(CLOSERS)
-
-    lines = [
-        f"Hi {greeting_name},",
-        "",
-        opener,
-        "",
-        body,
-        "",
-        closer,
-        "",
-        sign_off,
-        sender_name,
-    ]
-
-    # Optionally quote original (50% chance)
-    if original_body_snippet and random.random() < 0.5:
-        snippet_lines = original_body_snippet.strip().split("\n")[:4]
-        quoted = "\n".join(f"> {l}" for l in snippet_lines)
-        lines += ["", "---", quoted]
-
-    return "\n".join(lines)
-
-
-def generate_email(
-    sender_name: str,
-    recipient_name: str = "",
-    is_reply: bool = False,
-    original_subject: str = "",
-    original_body_snippet: str = "",
-) -> GeneratedContent:
-    """
-    Convenience function: generate complete email content.
-    Returns GeneratedContent with subject and body.
-    """
-    if is_reply and original_subject:
-        subject = (original_subject if original_subject.lower().startswith("re:")
-                   else f"Re: {original_subject}")
-        body = generate_reply_body(
-            sender_name=sender_name,
-            recipient_name=recipient_name,
-            original_subject=original_subject,
-            original_body_snippet=original_body_snippet,
-        )
-    else:
-        subject = generate_subject()
-        body = generate_body(
-            sender_name=sender_name,
-            recipient_name=recipient_name,
-        )
-
-    return GeneratedContent(subject=subject, body=body)
+"""
+core/content_generator.py
+Generates human-like email content using Faker for subject and body variation.
+No links, no HTML tags in plain text. No fixed patterns.
+"""
+import functools
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+@functools.cache
+def _get_faker():
+    """
+    Construct the Faker instance on first use. Importing faker and building
+    its locale tables costs hundreds of ms, which cold-start shouldn't pay
+    before any content is actually generated. Returns None if faker is not
+    installed (fallback pools are used instead).
+    """
+    try:
+        from faker import Faker
+    except ImportError:
+        return None
+    return Faker("en_US")
+
+
+# ── Subject line templates ─────────────────────────────────────────────────── #
+
+SUBJECT_TEMPLATES = [
+    "Following up on {topic}",
+    "Quick question about {topic}",
+    "Checking in about {topic}",
+    "Thoughts on {topic}?",
+    "Re: {topic} update",
+    "{topic} - a quick note",
+    "Regarding {topic}",
+    "Quick note on {topic}",
+    "Update on {topic}",
+    "{topic} - wanted to share something",
+    "Just checking in on {topic}",
+    "A thought about {topic}",
+    "Circling back on {topic}",
+    "Any progress on {topic}?",
+    "About {topic}",
+]
+
+# Pre-split templates into (prefix, suffix) pairs once at import so
+# generate_subject() avoids re-parsing the {topic} placeholder per call.
+_SUBJECT_PARTS = [tuple(t.split("{topic}")) for t in SUBJECT_TEMPLATES]
+
+TOPICS = [
+    "the project timeline",
+    "our last discussion",
+    "the upcoming meeting",
+    "the proposal",
+    "Q4 planning",
+    "the draft document",
+    "the deliverables",
+    "the partnership",
+    "your recent feedback",
+    "the budget review",
+    "the resource allocation",
+    "the strategy session",
+    "the client presentation",
+    "the workflow improvements",
+    "the team update",
+    "the quarterly goals",
+    "the onboarding process",
+    "the pending review",
+]
+
+# ── Opening lines ──────────────────────────────────────────────────────────── #
+
+OPENERS = [
+    "Hope you're doing well.",
+    "Thanks for your time earlier.",
+    "Just following up as promised.",
+    "Wanted to check in quickly.",
+    "Hope this finds you well.",
+    "Hope your week is going well.",
+    "Thanks for getting back to me.",
+    "Just a quick note.",
+    "I hope things are going smoothly on your end.",
+    "Circling back on this.",
+    "Wanted to reach out quickly.",
+    "Hope you had a good weekend.",
+]
+
+# ── Body paragraph starters ────────────────────────────────────────────────── #
+
+PARA_STARTERS = [
+    "I wanted to touch base regarding",
+    "I've been thinking about",
+    "Just wanted to let you know that",
+    "Following our last conversation,",
+    "I had a few thoughts about",
+    "Wanted to share a quick update on",
+    "I came across something relevant to",
+    "As we discussed,",
+    "Building on what we talked about,",
+    "I wanted to get your perspective on",
+]
+
+# ── Closing lines ──────────────────────────────────────────────────────────── #
+
+CLOSERS = [
+    "Let me know your thoughts.",
+    "Looking forward to hearing from you.",
+    "Happy to discuss further if helpful.",
+    "Please let me know if you have any questions.",
+    "Feel free to reach out anytime.",
+    "Let me know if there's anything I can help with.",
+    "Happy to hop on a call if needed.",
+    "Let me know how you'd like to proceed.",
+    "Looking forward to your response.",
+    "Let me know what works best for you.",
+]
+
+REPLY_OPENERS = [
+    "Thanks for reaching out.",
+    "Thanks for the update.",
+    "Appreciate you getting back to me.",
+    "Thanks for the note.",
+    "Good to hear from you.",
+]
+
+SIGN_OFFS = [
+    "Best regards,",
+    "Best,",
+    "Thanks,",
+    "Warm regards,",
+    "Kind regards,",
+    "Regards,",
+    "Many thanks,",
+    "Cheers,",
+]
+
+
+@dataclass
+class GeneratedContent:
+    subject: str
+    body: str           # Plain text, no HTML, no links
+
+
+_FALLBACK_SENTENCES = [
+    "I wanted to make sure we're aligned on the next steps.",
+    "There are a few things I'd like your input on.",
+    "Let me know if the timeline still works for you.",
+    "I've reviewed the materials and have some thoughts.",
+    "We may need to revisit a few of the assumptions.",
+]
+
+
+def _random_sentences(count: int, rng: random.Random = random) -> list:
+    """Return `count` random human-sounding sentences in one batch."""
+    if count <= 0:
+        return []
+    faker = _get_faker()
+    if faker is not None:
+        return faker.sentences(nb=count)
+    return rng.choices(_FALLBACK_SENTENCES, k=count)
+
+
+def _random_sentence(rng: random.Random = random) -> str:
+    """Return a random human-sounding sentence."""
+    faker = _get_faker()
+    if faker is not None:
+        return faker.sentence(nb_words=rng.randint(8, 18))
+    return rng.choice(_FALLBACK_SENTENCES)
+
+
+def _random_name(rng: random.Random = random) -> str:
+    """Return a random first name."""
+    faker = _get_faker()
+    if faker is not None:
+        return faker.first_name()
+    return rng.choice(["Alex", "Jordan", "Sam", "Morgan", "Taylor", "Riley"])
+
+
+def generate_subject(rng: random.Random = random) -> str:
+    """Generate a natural-sounding email subject."""
+    prefix, suffix = rng.choice(_SUBJECT_PARTS)
+    return prefix + rng.choice(TOPICS) + suffix
+
+
+def generate_body(
+    sender_name: str,
+    recipient_name: str = "",
+    word_count_range: tuple = (80, 250),
+    rng: random.Random = random,
+) -> str:
+    """
+    Generate a human-like plain-text email body.
+    No links, no HTML, no fixed patterns.
+    Pass a per-thread `rng` to avoid contention on the module-level RNG.
+    """
+    greeting_name = (recipient_name.split()[0] if recipient_name
+                     else _random_name(rng))
+    opener = rng.choice(OPENERS)
+    sign_off = rng.choice(SIGN_OFFS)
+
+    # Build paragraphs.
+    # Draw every categorical pick up front — one random.choices call per pool
+    # amortizes the RNG overhead versus one random.choice per loop pass.
+    target_words = rng.randint(*word_count_range)
+    max_paras = target_words // 20 + 1
+    starters = rng.choices(PARA_STARTERS, k=max_paras)
+    para_topics = rng.choices(TOPICS, k=max_paras)
+    sentence_counts = rng.choices((1, 2, 3), k=max_paras)
+    sentence_pool = _random_sentences(sum(sentence_counts), rng)
+
+    paragraphs = []
+    current_words = 0
+    consumed = 0
+
+    for i in range(max_paras):
+        if current_words >= target_words:
+            break
+        n = sentence_counts[i]
+        sentences = [f"{starters[i]} {para_topics[i]}."]
+        sentences.extend(sentence_pool[consumed:consumed + n])
+        consumed += n
+        para = " ".join(sentences)
+        paragraphs.append(para)
+        current_words += len(para.split())
+
+    closer = rng.choice(CLOSERS)
+
+    body = "\n\n".join(paragraphs[:3])  # max 3 body paragraphs
+    return (
+        f"Hi {greeting_name},\n\n{opener}\n\n{body}\n\n"
+        f"{closer}\n\n{sign_off}\n{sender_name}"
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _reply_skeleton(sender_name: str, greeting_name: str) -> str:
+    """
+    Cached fixed structure for a reply body. Reply bursts repeat the same
+    sender/recipient pair, so the greeting/signature framing is built once
+    per pair and the four variable parts are filled in with one format_map.
+    """
+    return (
+        f"Hi {greeting_name},\n\n{{opener}}\n\n{{body}}\n\n"
+        f"{{closer}}\n\n{{sign_off}}\n{sender_name}"
+    )
+
+
+def _assemble_reply(
+    sender_name: str,
+    recipient_name: str,
+    original_body_snippet: str,
+    body: str,
+    rng: random.Random,
+) -> str:
+    """Wrap a pre-drawn reply body in greeting/closing framing."""
+    greeting_name = (recipient_name.split()[0] if recipient_name
+                     else _random_name(rng))
+    text = _reply_skeleton(sender_name, greeting_name).format_map({
+        "opener": rng.choice(REPLY_OPENERS),
+        "body": body,
+        "closer": rng.choice(CLOSERS),
+        "sign_off": rng.choice(SIGN_OFFS),
+    })
+
+    # Optionally quote original (50% chance)
+    if original_body_snippet and rng.random() < 0.5:
+        snippet_lines = original_body_snippet.strip().split("\n")[:4]
+        quoted = "\n".join(f"> {l}" for l in snippet_lines)
+        text += f"\n\n---\n{quoted}"
+
+    return text
+
+
+def generate_reply_body(
+    sender_name: str,
+    recipient_name: str,
+    original_subject: str,
+    original_body_snippet: str = "",
+    rng: random.Random = random,
+) -> str:
+    """
+    Generate a brief, natural reply to an email.
+    Quotes a small snippet of the original.
+    """
+    # Short reply body (2-3 sentences)
+    body = " ".join(_random_sentences(rng.randint(1, 3), rng))
+    return _assemble_reply(
+        sender_name, recipient_name, original_body_snippet, body, rng,
+    )
+
+
+def _reply_subject(original_subject: str) -> str:
+    return (original_subject if original_subject.lower().startswith("re:")
+            else f"Re: {original_subject}")
+
+
+def generate_email_batch(
+    sender_name: str,
+    originals: list,
+    rng: random.Random = random,
+) -> list:
+    """
+    Batch variant of generate_email(is_reply=True) for a burst of replies
+    from one sender. originals: list of (recipient_name, original_subject,
+    original_body_snippet) tuples. Draws all sentence counts up front and
+    fetches every sentence in a single _random_sentences call, amortizing
+    the RNG and Faker overhead across the batch.
+    """
+    if not originals:
+        return []
+    counts = rng.choices((1, 2, 3), k=len(originals))
+    pool = _random_sentences(sum(counts), rng)
+
+    results = []
+    consumed = 0
+    for (recipient_name, original_subject, snippet), n in zip(originals,
+                                                              counts):
+        body = " ".join(pool[consumed:consumed + n])
+        consumed += n
+        results.append(GeneratedContent(
+            subject=_reply_subject(original_subject),
+            body=_assemble_reply(sender_name, recipient_name, snippet,
+                                 body, rng),
+        ))
+    return results
+
+
+def generate_email(
+    sender_name: str,
+    recipient_name: str = "",
+    is_reply: bool = False,
+    original_subject: str = "",
+    original_body_snippet: str = "",
+    rng: random.Random = random,
+) -> GeneratedContent:
+    """
+    Convenience function: generate complete email content.
+    Returns GeneratedContent with subject and body.
+    Callers running in worker threads should pass their own random.Random
+    to keep RNG state off the shared module-level instance.
+    """
+    if is_reply and original_subject:
+        subject = _reply_subject(original_subject)
+        body = generate_reply_body(
+            sender_name=sender_name,
+            recipient_name=recipient_name,
+            original_subject=original_subject,
+            original_body_snippet=original_body_snippet,
+            rng=rng,
+        )
+    else:
+        subject = generate_subject(rng)
+        body = generate_body(
+            sender_name=sender_name,
+            recipient_name=recipient_name,
+            rng=rng,
+        )
+
+    return GeneratedContent(subject=subject, body=body)
@@ -3,22 +3,68 @@ core/logger.py
 Thin facade over LogStore for structured event logging.
 Never logs passwords or sensitive credentials.
 """
-from datetime import datetime
+import atexit
+import collections
+import re
+import threading
+import time
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from storage.log_store import LogStore, LogRecord
 
+# Compiled once at import — error storms (e.g. repeated IMAP failures) hit
+# the redaction path on every event.
+_PWD_RE = re.compile(r"(password|passwd|pass|pwd)\s*[=:]\s*\S+", re.IGNORECASE)
+
+# Timestamp strings rebuilt at most once per second. Every send/reply/error
+# event wants one, and time.strftime on a cached second beats allocating a
+# datetime per event. The unlocked update race is benign — worst case two
+# threads format the same second twice.
+_ts_second = 0
+_ts_iso = ""
+_ts_hms = ""
+
+
+def _refresh_timestamps() -> None:
+    global _ts_second, _ts_iso, _ts_hms
+    now = int(time.time())
+    if now != _ts_second:
+        _ts_iso = time.strftime("%Y-%m-%dT%H:%M:%S")
+        _ts_hms = _ts_iso[11:]
+        _ts_second = now
+
+
+def timestamp_iso() -> str:
+    """Current local time as 'YYYY-MM-DDTHH:MM:SS' (cached per second)."""
+    _refresh_timestamps()
+    return _ts_iso
+
+
+def timestamp_hms() -> str:
+    """Current local time as 'HH:MM:SS' (cached per second)."""
+    _refresh_timestamps()
+    return _ts_hms
+
 
 class WarmupLogger:
     """
     Wraps LogStore with typed log methods.
     All methods are safe to call from background threads
     (LogStore itself is thread-safe via threading.Lock).
+    Records are buffered and flushed in batches (size or age triggered) so
+    event bursts don't pay a lock/open/write cycle per record.
     """
 
+    FLUSH_BATCH = 32       # records buffered before a flush
+    FLUSH_INTERVAL = 5.0   # seconds a record may sit in the buffer
+
     def __init__(self, log_store: "LogStore") -> None:
         self._store = log_store
+        self._buf = collections.deque(maxlen=256)
+        self._buf_lock = threading.Lock()
+        self._last_flush = time.time()
+        atexit.register(self.flush)
 
     def _write(
         self,
@@ -30,15 +76,30 @@ class WarmupLogger:
     ) -> None:
         from storage.log_store import LogRecord
         record = LogRecord(
-            timestamp=datetime.now().isoformat(timespec="seconds"),
+            timestamp=timestamp_iso(),
             inbox_email=inbox_email,
             event_type=event_type,
             recipient=recipient,
             subject=subject,
             details=details,
         )
+        with self._buf_lock:
+            self._buf.append(record)
+            due = (len(self._buf) >= self.FLUSH_BATCH
+                   or time.time() - self._last_flush >= self.FLUSH_INTERVAL)
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Drain the buffer into LogStore. Never raises to the caller."""
+        with self._buf_lock:
+            if not self._buf:
+                return
+            records = list(self._buf)
+            self._buf.clear()
+            self._last_flush = time.time()
         try:
-            self._store.append(record)
+            self._store.append_many(records)
         except Exception as exc:
             # Logging must never crash the caller
             print(f"[WarmupLogger] Failed to write log: {exc}")
@@ -79,12 +140,5 @@ class WarmupLogger:
 
 def _redact_passwords(text: str) -> str:
     """Remove common password-like patterns from log strings."""
-    import re
     # Redact anything that looks like password=<value>
-    text = re.sub(
-        r"(password|passwd|pass|pwd)\s*[=:]\s*\S+",
-        r"\1=***",
-        text,
-        flags=re.IGNORECASE,
-    )
-    return text
+    return _PWD_RE.sub(r"\1=***", text)
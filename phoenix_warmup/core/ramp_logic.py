@@ -5,6 +5,7 @@ Pure functions: no I/O, no side effects, easily testable.
 """
 import os
 import random
+import time
 from datetime import datetime
 
 # Stage → emails per day limit
@@ -17,6 +18,11 @@ STAGE_LIMITS = {
 
 MAX_STAGE = 4
 
+# Tuple mirror of STAGE_LIMITS for constant-time indexing on the send hot
+# path (index 0 is unused — stages are 1-based).
+DAILY_LIMITS = (STAGE_LIMITS[1], STAGE_LIMITS[1], STAGE_LIMITS[2],
+                STAGE_LIMITS[3], STAGE_LIMITS[4])
+
 # Minimum interval between sends per stage (seconds): (min, max)
 STAGE_SEND_INTERVALS = {
     1: (1800, 10800),   # 30 min – 3 hours
@@ -28,20 +34,54 @@ STAGE_SEND_INTERVALS = {
 # Reply delay range per stage (seconds)
 REPLY_DELAY_RANGE = (300, 2700)   # 5 – 45 minutes
 
+# Env-derived settings come from .env loaded at startup and never change at
+# runtime, so parse each once on first use instead of per call.
+_env_cache: dict = {}
+
+
+def _cached_env(name: str, default: str, parse=str):
+    try:
+        return _env_cache[name]
+    except KeyError:
+        value = parse(os.environ.get(name, default))
+        _env_cache[name] = value
+        return value
+
 
 def get_daily_limit(stage: int) -> int:
     """Return the daily send limit for a given stage."""
-    return STAGE_LIMITS.get(stage, STAGE_LIMITS[1])
+    if 1 <= stage <= MAX_STAGE:
+        return DAILY_LIMITS[stage]
+    return DAILY_LIMITS[1]
 
 
-def should_send(inbox: dict) -> bool:
-    """
-    Return True if the inbox has not yet hit its daily limit.
-    inbox: dict with keys 'daily_sent' and 'daily_limit'
-    """
-    sent = int(inbox.get("daily_sent", 0))
-    limit = int(inbox.get("daily_limit", get_daily_limit(1)))
-    return sent < limit
+def should_send(daily_sent: int, daily_limit: int) -> bool:
+    """Return True if the inbox has not yet hit its daily limit."""
+    return daily_sent < daily_limit
+
+
+# ── Pure numeric cores ─────────────────────────────────────────────────────── #
+# The outer functions handle env vars, RNG draws, and datetime parsing; the
+# cores below are plain integer/float arithmetic, called per inbox per tick.
+
+def _delay_core(low: int, high: int, base: float, jitter: float) -> int:
+    """Clamp a jittered delay draw to at least half the stage minimum."""
+    return max(int(low * 0.5), int(base + jitter))
+
+
+def _within_hours_core(current_minutes: int, start: int, end: int) -> bool:
+    """Minute-of-day window check, handling overnight wrap-around."""
+    if start <= end:
+        return start <= current_minutes <= end
+    # Overnight window (e.g. 22:00 – 06:00)
+    return current_minutes >= start or current_minutes <= end
+
+
+def _bounce_rate_core(sent: int, bounced: int, threshold: float) -> bool:
+    """True if bounced/sent exceeds threshold (False when nothing sent)."""
+    if sent == 0:
+        return False
+    return (bounced / sent) > threshold
 
 
 def get_send_delay_seconds(stage: int) -> int:
@@ -50,7 +90,7 @@ def get_send_delay_seconds(stage: int) -> int:
     base = random.uniform(low, high)
     # Gaussian jitter ±10% of range
     jitter = random.gauss(0, (high - low) * 0.05)
-    return max(int(low * 0.5), int(base + jitter))
+    return _delay_core(low, high, base, jitter)
 
 
 def get_reply_delay_seconds() -> int:
@@ -66,9 +106,9 @@ def within_working_hours(start_str: str = None, end_str: str = None) -> bool:
     Format: 'HH:MM' (24-hour).
     """
     if start_str is None:
-        start_str = os.environ.get("WORK_START", "08:00")
+        start_str = _cached_env("WORK_START", "08:00")
     if end_str is None:
-        end_str = os.environ.get("WORK_END", "20:00")
+        end_str = _cached_env("WORK_END", "20:00")
 
     now = datetime.now()
     current_minutes = now.hour * 60 + now.minute
@@ -80,30 +120,39 @@ def within_working_hours(start_str: str = None, end_str: str = None) -> bool:
     start = parse(start_str)
     end = parse(end_str)
 
-    if start <= end:
-        return start <= current_minutes <= end
-    # Overnight window (e.g. 22:00 – 06:00)
-    return current_minutes >= start or current_minutes <= end
+    return _within_hours_core(current_minutes, start, end)
 
 
-def check_bounce_threshold(inbox: dict) -> bool:
+def check_bounce_threshold(daily_sent: int, bounced_today: int) -> bool:
     """
     Return True if the inbox's bounce rate exceeds the threshold.
-    inbox: dict with 'bounced_today' and 'sent_today' keys.
     Threshold from BOUNCE_THRESHOLD env var (default 0.05 = 5%).
     """
-    threshold = float(os.environ.get("BOUNCE_THRESHOLD", "0.05"))
-    sent = int(inbox.get("daily_sent", 0))
-    bounced = int(inbox.get("bounced_today", 0))
-    if sent == 0:
-        return False
-    return (bounced / sent) > threshold
+    threshold = _cached_env("BOUNCE_THRESHOLD", "0.05", float)
+    return _bounce_rate_core(daily_sent, bounced_today, threshold)
+
+
+def schedule_next_send(stage: int) -> float:
+    """
+    Draw the next-send target once, at send time, and return it as an epoch
+    float. Checking against a stored target (see is_send_due) avoids
+    redrawing the random delay on every scheduler tick, which both wastes
+    RNG calls and biases the effective interval toward its short end.
+    """
+    return time.time() + get_send_delay_seconds(stage)
+
+
+def is_send_due(next_send_at: float) -> bool:
+    """Return True once the stored next-send target has passed."""
+    return time.time() >= next_send_at
 
 
 def is_time_to_send(last_sent_at: str, stage: int) -> bool:
     """
     Return True if enough time has passed since last_sent_at to send again.
     last_sent_at: ISO datetime string or empty string.
+    Fallback path for inboxes without a stored next-send target
+    (e.g. right after startup); redraws the delay per check.
     """
     if not last_sent_at:
         return True
@@ -119,3 +168,43 @@ def is_time_to_send(last_sent_at: str, stage: int) -> bool:
 def next_stage(current_stage: int) -> int:
     """Return the next stage, capped at MAX_STAGE."""
     return min(current_stage + 1, MAX_STAGE)
+
+
+def working_window_seconds(start_str: str, end_str: str) -> int:
+    """Length of the daily working window in seconds (overnight-safe)."""
+    def parse(s: str) -> int:
+        h, m = map(int, s.split(":"))
+        return h * 60 + m
+
+    start = parse(start_str)
+    end = parse(end_str)
+    minutes = end - start if start <= end else 24 * 60 - start + end
+    return max(minutes, 1) * 60
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: tokens refill continuously at `rate` per
+    second up to `burst`. Lets an inbox catch up after a gap (bounded by
+    the burst) while capping its sustained rate at the provider-friendly
+    daily_limit / working-window pace. Pure time arithmetic, no locking —
+    each bucket is owned by a single inbox.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.time()
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        """Take one token if available; never blocks."""
+        now = time.time()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
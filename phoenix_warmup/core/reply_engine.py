@@ -5,20 +5,33 @@ Called by the scheduler's IMAP check job.
 Reply rate is configurable via .env (REPLY_RATE, default 0.4).
 """
 import os
-import queue
 import random
+import re
 import logging
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
-from core.imap_engine import IMAPEngine, FetchedMessage
 from core.smtp_engine import SMTPEngine
-from core.content_generator import generate_email
-from core.logger import WarmupLogger
+from core.content_generator import generate_email_batch
+from core.logger import WarmupLogger, timestamp_hms
 from storage.inbox_store import InboxStore, InboxRecord
 from storage.log_store import LogStore
 
+if TYPE_CHECKING:
+    from core.imap_engine import IMAPEngine, FetchedMessage
+    from core.ui_events import UIEventQueue
+
 logger = logging.getLogger("phoenix.reply")
 
+# System/auto-generated mail markers — one compiled scan per subject instead
+# of a substring search per keyword.
+_SKIP_RE = re.compile(
+    r"unsubscribe|no-?reply|bounce|auto-reply|out of office|vacation"
+    r"|delivery failure",
+    re.IGNORECASE,
+)
+
 
 class ReplyEngine:
     """
@@ -30,17 +43,41 @@ class ReplyEngine:
         self,
         inbox_store: InboxStore,
         log_store: LogStore,
-        ui_queue: queue.Queue,
+        ui_queue: "UIEventQueue",
     ) -> None:
         self.inbox_store = inbox_store
         self.log_store = log_store
         self.ui_queue = ui_queue
+        # Flipped on by App once the dashboard exists (see WarmupEngine).
+        self.ui_queue_enabled = False
         self._warmup_logger = WarmupLogger(log_store)
-
-    @property
-    def reply_rate(self) -> float:
-        """Fraction of received emails to reply to (0.0–1.0)."""
-        return float(os.environ.get("REPLY_RATE", "0.40"))
+        # Fraction of received emails to reply to (0.0–1.0). Parsed once —
+        # .env is loaded at startup, so re-reading per message is pure overhead.
+        self.reply_rate = float(os.environ.get("REPLY_RATE", "0.40"))
+        # Inboxes are independent IMAP sessions, so scan them concurrently —
+        # the cycle is dominated by per-inbox TLS handshakes otherwise.
+        self._pool = ThreadPoolExecutor(
+            max_workers=int(os.environ.get("REPLY_CONCURRENCY", "8")),
+            thread_name_prefix="reply",
+        )
+        # One persistent IMAPEngine per inbox so the TLS+LOGIN handshake is
+        # paid once, not once per cycle.
+        self._imap_engines: dict = {}
+        self._engine_lock = threading.Lock()
+        # Display names derived from inbox emails are stable — compute once
+        # per inbox instead of on every reply.
+        self._sender_display: dict = {}
+        # One random.Random per worker thread — keeps pool workers off the
+        # shared module-level Mersenne Twister state.
+        self._thread_local = threading.local()
+
+    def _rng(self) -> random.Random:
+        """Per-thread RNG instance for gate checks and content generation."""
+        rng = getattr(self._thread_local, "rng", None)
+        if rng is None:
+            rng = random.Random()
+            self._thread_local.rng = rng
+        return rng
 
     def run_reply_cycle(self) -> None:
         """
@@ -53,64 +90,109 @@ class ReplyEngine:
             logger.error(f"Failed to load active inboxes for reply cycle: {exc}")
             return
 
-        for inbox in active:
-            try:
-                self._process_inbox_replies(inbox)
-            except Exception as exc:
-                logger.exception(f"Reply error for {inbox.email}: {exc}")
+        if not active:
+            return
+
+        # Block until the whole fan-out finishes so the scheduler's
+        # max_instances=1 guard still covers the in-flight work.
+        list(self._pool.map(self._process_inbox_replies_safe, active))
+
+    def _process_inbox_replies_safe(self, inbox: InboxRecord) -> None:
+        """Per-worker wrapper: errors never escape to the pool."""
+        try:
+            self._process_inbox_replies(inbox)
+        except Exception as exc:
+            logger.exception(f"Reply error for {inbox.email}: {exc}")
+
+    def _get_imap_engine(self, inbox: InboxRecord) -> "IMAPEngine":
+        """Return the cached engine for an inbox, rebuilding it if the
+        stored credentials or host changed."""
+        # Imported here so imapclient isn't loaded until the first scan —
+        # users with no active inboxes never pay its import cost.
+        from core.imap_engine import IMAPEngine
+
+        with self._engine_lock:
+            engine = self._imap_engines.get(inbox.email)
+            if engine is not None and (
+                engine.host != inbox.imap_host
+                or engine.port != inbox.imap_port
+                or engine.password != inbox.password
+            ):
+                engine.close()
+                engine = None
+            if engine is None:
+                engine = IMAPEngine(
+                    host=inbox.imap_host,
+                    port=inbox.imap_port,
+                    email=inbox.email,
+                    password=inbox.password,
+                )
+                self._imap_engines[inbox.email] = engine
+            return engine
 
     def _process_inbox_replies(self, inbox: InboxRecord) -> None:
         """Fetch unseen messages for one inbox and reply to qualifying ones."""
-        imap = IMAPEngine(
-            host=inbox.imap_host,
-            port=inbox.imap_port,
-            email=inbox.email,
-            password=inbox.password,
-        )
+        imap = self._get_imap_engine(inbox)
 
         messages = imap.fetch_unseen()
         if not messages:
             return
 
-        for msg in messages:
-            if self._should_reply(msg):
-                self._send_reply(inbox, msg)
+        # Apply the probabilistic gate first — losers (the majority at the
+        # default reply rate) cost nothing beyond the rate check.
+        candidates = [m for m in messages if self._should_reply(m)]
+        if not candidates:
+            return
+
+        # Generate all winning reply bodies in one batched call so the RNG
+        # and Faker overhead is amortized across the burst.
+        rng = self._rng()
+        contents = generate_email_batch(
+            self._get_sender_display(inbox.email),
+            [(m.from_name or m.local_part, m.subject, m.body_text[:300])
+             for m in candidates],
+            rng=rng,
+        )
 
-    def _should_reply(self, msg: FetchedMessage) -> bool:
+        # One SMTPEngine for the whole batch — avoids rebuilding the sender
+        # (and its handshake state) for every reply to the same inbox.
+        smtp = SMTPEngine(
+            host=inbox.smtp_host,
+            port=inbox.smtp_port,
+            email=inbox.email,
+            password=inbox.password,
+        )
+        for msg, content in zip(candidates, contents):
+            self._send_reply(inbox, msg, content, smtp)
+
+    def _should_reply(self, msg: "FetchedMessage") -> bool:
         """
         Probabilistic gate — reply to reply_rate fraction of messages.
         Also skips messages from the same domain (self-loops) or
         messages that look like system/auto-generated mail.
         """
-        subject = msg.subject.lower()
         # Skip obvious system emails
-        if any(kw in subject for kw in [
-            "unsubscribe", "no-reply", "noreply", "bounce",
-            "auto-reply", "out of office", "vacation", "delivery failure",
-        ]):
+        if _SKIP_RE.search(msg.subject):
             return False
         # Probabilistic gate
-        return random.random() < self.reply_rate
-
-    def _send_reply(self, inbox: InboxRecord, msg: FetchedMessage) -> None:
-        """Generate and send a reply to a received message."""
-        # Generate reply content
-        sender_display = inbox.email.split("@")[0].replace(".", " ").title()
-        content = generate_email(
-            sender_name=sender_display,
-            recipient_name=msg.from_name or msg.from_email.split("@")[0],
-            is_reply=True,
-            original_subject=msg.subject,
-            original_body_snippet=msg.body_text[:300],
-        )
+        return self._rng().random() < self.reply_rate
 
-        smtp = SMTPEngine(
-            host=inbox.smtp_host,
-            port=inbox.smtp_port,
-            email=inbox.email,
-            password=inbox.password,
-        )
+    def _get_sender_display(self, inbox_email: str) -> str:
+        """Display name derived from the inbox address, computed once."""
+        sender_display = self._sender_display.get(inbox_email)
+        if sender_display is None:
+            sender_display = inbox_email.split("@")[0].replace(".", " ").title()
+            self._sender_display[inbox_email] = sender_display
+        return sender_display
 
+    def _send_reply(
+        self,
+        inbox: InboxRecord,
+        msg: "FetchedMessage",
+        content,
+        smtp: SMTPEngine,
+    ) -> None:
+        """Send one pre-generated reply to a received message."""
         result = smtp.send(
             to_email=msg.from_email,
             to_name=msg.from_name or msg.from_email,
@@ -136,13 +218,12 @@ class ReplyEngine:
                           f"Reply failed: {result.error_message[:60]}")
 
     def _post_ui(self, event_type: str, inbox_email: str, message: str) -> None:
-        """Non-blocking push to UI queue."""
-        try:
-            self.ui_queue.put_nowait({
-                "type": event_type,
-                "inbox": inbox_email,
-                "message": message,
-                "timestamp": datetime.now().strftime("%H:%M:%S"),
-            })
-        except queue.Full:
-            pass
+        """Non-blocking push to UI queue (never blocks, never raises)."""
+        if not self.ui_queue_enabled:
+            return
+        self.ui_queue.put_nowait({
+            "type": event_type,
+            "inbox": inbox_email,
+            "message": message,
+            "timestamp": timestamp_hms(),
+        })
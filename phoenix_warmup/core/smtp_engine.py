@@ -1,156 +1,373 @@
-"""
-core/smtp_engine.py
-SMTP email sending via Zoho (smtp.zoho.in:587, STARTTLS).
-Returns structured results; never raises to caller.
-Plain text only. No HTML. No links.
-"""
-import smtplib
-import ssl
-import time
-from dataclasses import dataclass, field
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.utils import formataddr, make_msgid
-from typing import Optional
-
-
-# SMTP response codes classified as hard bounces (permanent failures)
-HARD_BOUNCE_CODES = {550, 551, 552, 553, 554, 555}
-# Soft bounces (temporary, may retry)
-SOFT_BOUNCE_CODES = {421, 450, 451, 452}
-
-CONNECT_TIMEOUT = 30  # seconds
-
-
-@dataclass
-class SendResult:
-    success: bool
-    message_id: str = ""
-    error_code: Optional[int] = None
-    error_message: str = ""
-    duration_ms: int = 0
-    is_hard_bounce: bool = False
-    is_soft_bounce: bool = False
-    is_auth_failure: bool = False
-
-
-class SMTPEngine:
-    """
-    Handles SMTP connection and email sending for a single inbox.
-    Each send() call creates a fresh connection (no persistent sessions).
-    """
-
-    def __init__(
-        self,
-        host: str,
-        port: int,
-        email: str,
-        password: str,
-        display_name: str = "",
-    ) -> None:
-        self.host = host
-        self.port = port
-        self.email = email
-        self.password = password
-        self.display_name = display_name or email
-
-    def send(
-        self,
-        to_email: str,
-        to_name: str,
-        subject: str,
-        body: str,
-        in_reply_to: Optional[str] = None,
-        references: Optional[str] = None,
-    ) -> SendResult:
-        """
-        Send one plain-text email via STARTTLS.
-        Returns a SendResult regardless of outcome — never raises.
-        """
-        start = time.monotonic()
-        msg_id = make_msgid(domain=self.email.split("@")[-1])
-
-        # Build MIME message — plain text only, no HTML
-        msg = MIMEText(body, "plain", "utf-8")
-        msg["Subject"] = subject
-        msg["From"] = formataddr((self.display_name, self.email))
-        msg["To"] = formataddr((to_name, to_email))
-        msg["Message-ID"] = msg_id
-        msg["X-Mailer"] = "Microsoft Outlook 16.0"
-        if in_reply_to:
-            msg["In-Reply-To"] = in_reply_to
-            msg["References"] = references or in_reply_to
-
-        try:
-            ctx = ssl.create_default_context()
-            with smtplib.SMTP(self.host, self.port, timeout=CONNECT_TIMEOUT) as smtp:
-                smtp.ehlo()
-                smtp.starttls(context=ctx)
-                smtp.ehlo()
-                smtp.login(self.email, self.password)
-                smtp.sendmail(self.email, [to_email], msg.as_string())
-
-            return SendResult(
-                success=True,
-                message_id=msg_id,
-                duration_ms=int((time.monotonic() - start) * 1000),
-            )
-
-        except smtplib.SMTPRecipientsRefused as exc:
-            code, reason_bytes = list(exc.recipients.values())[0]
-            reason = (reason_bytes.decode("utf-8", errors="replace")
-                      if isinstance(reason_bytes, bytes) else str(reason_bytes))
-            return SendResult(
-                success=False,
-                error_code=code,
-                error_message=reason,
-                duration_ms=int((time.monotonic() - start) * 1000),
-                is_hard_bounce=code in HARD_BOUNCE_CODES,
-                is_soft_bounce=code in SOFT_BOUNCE_CODES,
-            )
-
-        except smtplib.SMTPAuthenticationError as exc:
-            return SendResult(
-                success=False,
-                error_code=535,
-                error_message=f"Authentication failed: {exc.smtp_error!r}",
-                duration_ms=int((time.monotonic() - start) * 1000),
-                is_auth_failure=True,
-            )
-
-        except smtplib.SMTPConnectError as exc:
-            return SendResult(
-                success=False,
-                error_message=f"Connection refused: {exc}",
-                duration_ms=int((time.monotonic() - start) * 1000),
-                is_soft_bounce=True,
-            )
-
-        except (smtplib.SMTPException, TimeoutError, OSError) as exc:
-            return SendResult(
-                success=False,
-                error_message=str(exc),
-                duration_ms=int((time.monotonic() - start) * 1000),
-                is_soft_bounce=True,
-            )
-
-    def test_connection(self) -> tuple:
-        """
-        Quick auth probe: connect, STARTTLS, login, disconnect.
-        Returns (success: bool, message: str).
-        Used by the UI when adding/testing an inbox.
-        """
-        try:
-            ctx = ssl.create_default_context()
-            with smtplib.SMTP(self.host, self.port, timeout=CONNECT_TIMEOUT) as smtp:
-                smtp.ehlo()
-                smtp.starttls(context=ctx)
-                smtp.ehlo()
-                smtp.login(self.email, self.password)
-            return True, "SMTP connection successful"
-        except smtplib.SMTPAuthenticationError:
-            return False, "Authentication failed — check your app password"
-        except smtplib.SMTPConnectError:
-            return False, f"Cannot connect to {self.host}:{self.port}"
-        except Exception as exc:
-            return False, str(exc)
+"""
+core/smtp_engine.py
+SMTP email sending via Zoho (smtp.zoho.in:587, STARTTLS).
+Returns structured results; never raises to caller.
+Plain text only. No HTML. No links.
+"""
+import functools
+import smtplib
+import socket
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formataddr, make_msgid
+from typing import Optional
+
+
+# SMTP response codes classified as hard bounces (permanent failures)
+HARD_BOUNCE_CODES = {550, 551, 552, 553, 554, 555}
+# Soft bounces (temporary, may retry)
+SOFT_BOUNCE_CODES = {421, 450, 451, 452}
+
+CONNECT_TIMEOUT = 30  # seconds
+
+# One context for every connection — creation loads the system CA bundle
+# from disk, and all sends use identical TLS settings. SSLContext is safe
+# to share across threads for wrap_socket use.
+_SSL_CTX = ssl.create_default_context()
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_host_cached(host: str, ttl_bucket: int) -> str:
+    return socket.gethostbyname(host)
+
+
+def _resolve_host(host: str) -> str:
+    """
+    Resolve an SMTP hostname with a ~5-minute TTL cache, so pool recycles
+    don't pay a getaddrinfo round-trip each time. Certificate validation
+    still happens against the hostname (see acquire), so a stale or
+    poisoned entry can't silently connect us to the wrong server. Falls
+    back to the hostname itself if resolution fails.
+    """
+    try:
+        return _resolve_host_cached(host, int(time.time() // 300))
+    except OSError:
+        return host
+
+
+@dataclass
+class SendResult:
+    success: bool
+    message_id: str = ""
+    error_code: Optional[int] = None
+    error_message: str = ""
+    duration_ms: int = 0
+    is_hard_bounce: bool = False
+    is_soft_bounce: bool = False
+    is_auth_failure: bool = False
+
+
+class SMTPConnectionPool:
+    """
+    Reuses logged-in smtplib.SMTP connections keyed by (host, port, email).
+    The TLS handshake + AUTH round-trips dominate a single small send, so a
+    warm connection turns each send into one MAIL/RCPT/DATA exchange.
+
+    acquire() removes the connection from the pool (so two threads never
+    share a session) and release() returns it. Connections are health-checked
+    with NOOP before reuse, recycled after MAX_SENDS messages, and reaped
+    once idle longer than IDLE_TTL so a large inbox roster doesn't pin one
+    open socket per inbox between its (often far-apart) sends.
+    """
+
+    MAX_SENDS = 10_000  # recycle a connection after this many messages
+    IDLE_TTL = 600      # seconds before an unused connection is closed
+
+    def __init__(self) -> None:
+        self._conns: dict = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, host: str, port: int, email: str, password: str
+    ) -> tuple:
+        """
+        Return a (smtp, sends_so_far) pair with a logged-in session.
+        Raises the usual smtplib exceptions on connect/auth failure —
+        callers (SMTPEngine.send) already classify those.
+        """
+        key = (host, port, email)
+        with self._lock:
+            entry = self._conns.pop(key, None)
+
+        if entry is not None:
+            smtp, sends, last_used = entry
+            if (sends < self.MAX_SENDS
+                    and time.time() - last_used < self.IDLE_TTL):
+                try:
+                    if smtp.noop()[0] == 250:
+                        return smtp, sends
+                except (smtplib.SMTPException, OSError):
+                    pass  # Dead connection — fall through and reconnect
+            self.discard(smtp)
+
+        smtp = smtplib.SMTP(_resolve_host(host), port, timeout=CONNECT_TIMEOUT)
+        # starttls() validates the certificate against smtp._host — point it
+        # back at the hostname so connecting via the cached IP keeps full
+        # TLS/SNI verification.
+        smtp._host = host
+        try:
+            smtp.ehlo()
+            smtp.starttls(context=_SSL_CTX)
+            smtp.ehlo()
+            smtp.login(email, password)
+        except Exception:
+            self.discard(smtp)
+            raise
+        return smtp, 0
+
+    def release(
+        self, host: str, port: int, email: str, smtp, sends: int
+    ) -> None:
+        """Return a healthy connection to the pool for the next send."""
+        now = time.time()
+        stale = []
+        with self._lock:
+            previous = self._conns.get((host, port, email))
+            self._conns[(host, port, email)] = (smtp, sends, now)
+            # Piggyback idle reaping on release — no dedicated sweeper
+            # thread needed at this scale.
+            for key, (conn, _n, last_used) in list(self._conns.items()):
+                if now - last_used >= self.IDLE_TTL:
+                    stale.append(conn)
+                    del self._conns[key]
+        if previous is not None:
+            self.discard(previous[0])
+        for conn in stale:
+            self.discard(conn)
+
+    def discard(self, smtp) -> None:
+        """Close a connection that should not be reused."""
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        """Drop every pooled connection (app shutdown)."""
+        with self._lock:
+            entries = list(self._conns.values())
+            self._conns.clear()
+        for smtp, _sends, _last_used in entries:
+            self.discard(smtp)
+
+
+# Shared across all SMTPEngine instances — one warm connection per inbox.
+_POOL = SMTPConnectionPool()
+
+
+def _send_pipelined(smtp, from_addr: str, to_addrs: list, msg: bytes) -> None:
+    """
+    RFC 2920 PIPELINING: push MAIL FROM / RCPT TO / DATA back-to-back and
+    read the replies in one batch, collapsing three command round-trips
+    into one. Raises the same smtplib exceptions as sendmail() so the
+    error classification in send() is unchanged.
+    """
+    smtp.putcmd("mail", f"FROM:<{from_addr}>")
+    for addr in to_addrs:
+        smtp.putcmd("rcpt", f"TO:<{addr}>")
+    smtp.putcmd("data")
+
+    # Read all queued replies — even after a failure the later replies must
+    # be consumed to keep the command/response streams in sync.
+    mail_code, mail_resp = smtp.getreply()
+    rcpt_replies = [smtp.getreply() for _ in to_addrs]
+    data_code, data_resp = smtp.getreply()
+
+    if data_code == 354:
+        payload = smtplib._quote_periods(msg)
+        if payload[-2:] != smtplib.bCRLF:
+            payload += smtplib.bCRLF
+        payload += b"." + smtplib.bCRLF
+        smtp.send(payload)
+        end_code, end_resp = smtp.getreply()
+    else:
+        end_code, end_resp = data_code, data_resp
+
+    if mail_code != 250:
+        raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+    refused = {
+        addr: reply
+        for addr, reply in zip(to_addrs, rcpt_replies)
+        if reply[0] not in (250, 251)
+    }
+    if len(refused) == len(to_addrs):
+        try:
+            smtp.rset()
+        except smtplib.SMTPException:
+            pass
+        raise smtplib.SMTPRecipientsRefused(refused)
+    if data_code != 354:
+        raise smtplib.SMTPDataError(data_code, data_resp)
+    if end_code != 250:
+        raise smtplib.SMTPDataError(end_code, end_resp)
+
+
+def _send_message(smtp, from_addr: str, to_addrs: list, msg: bytes) -> None:
+    """Send via the pipelined path when the server advertises it."""
+    if smtp.has_extn("pipelining"):
+        _send_pipelined(smtp, from_addr, to_addrs, msg)
+    else:
+        smtp.sendmail(from_addr, to_addrs, msg)
+
+
+class SMTPEngine:
+    """
+    Handles SMTP connection and email sending for a single inbox.
+    Connections are pooled per (host, port, email) and reused across
+    send() calls; a dead session is transparently replaced.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        email: str,
+        password: str,
+        display_name: str = "",
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.email = email
+        self.password = password
+        self.display_name = display_name or email
+        self._domain = email.rpartition("@")[2]
+        # Every message from this inbox shares the same From/X-Mailer/MIME
+        # scaffolding — render AND encode it once; send() only formats the
+        # short variable tail and concatenates bytes.
+        self._hdr_template = (
+            f"From: {formataddr((self.display_name, self.email))}\r\n"
+            "X-Mailer: Microsoft Outlook 16.0\r\n"
+            "MIME-Version: 1.0\r\n"
+            'Content-Type: text/plain; charset="utf-8"\r\n'
+            "Content-Transfer-Encoding: 8bit\r\n"
+        ).encode("utf-8")
+
+    def send(
+        self,
+        to_email: str,
+        to_name: str,
+        subject: str,
+        body: str,
+        in_reply_to: Optional[str] = None,
+        references: Optional[str] = None,
+    ) -> SendResult:
+        """
+        Send one plain-text email via STARTTLS.
+        Returns a SendResult regardless of outcome — never raises.
+        """
+        start = time.monotonic()
+        msg_id = make_msgid(domain=self._domain)
+
+        # Build the message as raw bytes — plain text only, no HTML. The
+        # fixed header block is pre-encoded in __init__; only the
+        # per-message tail and the UTF-8 body are rendered here.
+        tail = (
+            f"To: {formataddr((to_name, to_email))}\r\n"
+            f"Subject: {subject}\r\n"
+            f"Message-ID: {msg_id}\r\n"
+        )
+        if in_reply_to:
+            tail += (
+                f"In-Reply-To: {in_reply_to}\r\n"
+                f"References: {references or in_reply_to}\r\n"
+            )
+        msg_bytes = (
+            self._hdr_template
+            + tail.encode("utf-8")
+            + b"\r\n"
+            + body.replace("\n", "\r\n").encode("utf-8")
+        )
+
+        smtp = None
+        sends = 0
+        try:
+            smtp, sends = _POOL.acquire(
+                self.host, self.port, self.email, self.password
+            )
+            try:
+                _send_message(smtp, self.email, [to_email], msg_bytes)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the pooled session between the NOOP check
+                # and the send — retry once on a fresh connection.
+                _POOL.discard(smtp)
+                smtp = None
+                smtp, sends = _POOL.acquire(
+                    self.host, self.port, self.email, self.password
+                )
+                _send_message(smtp, self.email, [to_email], msg_bytes)
+            _POOL.release(self.host, self.port, self.email, smtp, sends + 1)
+
+            result = SendResult(success=True, message_id=msg_id)
+
+        except smtplib.SMTPRecipientsRefused as exc:
+            # sendmail() issues RSET before raising, so the session stays
+            # clean — keep it pooled for the next attempt.
+            if smtp is not None:
+                _POOL.release(self.host, self.port, self.email, smtp, sends + 1)
+            # Single-recipient sends — grab the first entry without
+            # materializing the values view into a list.
+            code, reason_bytes = next(iter(exc.recipients.values()))
+            reason = (reason_bytes.decode("utf-8", errors="replace")
+                      if isinstance(reason_bytes, bytes) else str(reason_bytes))
+            result = SendResult(
+                success=False,
+                error_code=code,
+                error_message=reason,
+                is_hard_bounce=code in HARD_BOUNCE_CODES,
+                is_soft_bounce=code in SOFT_BOUNCE_CODES,
+            )
+
+        except smtplib.SMTPAuthenticationError as exc:
+            result = SendResult(
+                success=False,
+                error_code=535,
+                error_message=f"Authentication failed: {exc.smtp_error!r}",
+                is_auth_failure=True,
+            )
+
+        except smtplib.SMTPConnectError as exc:
+            result = SendResult(
+                success=False,
+                error_message=f"Connection refused: {exc}",
+                is_soft_bounce=True,
+            )
+
+        except (smtplib.SMTPException, TimeoutError, OSError) as exc:
+            if smtp is not None:
+                _POOL.discard(smtp)
+            result = SendResult(
+                success=False,
+                error_message=str(exc),
+                is_soft_bounce=True,
+            )
+
+        # One clock read for every outcome instead of one per branch
+        result.duration_ms = int((time.monotonic() - start) * 1000)
+        return result
+
+    def test_connection(self) -> tuple:
+        """
+        Quick auth probe: connect, STARTTLS, login.
+        Returns (success: bool, message: str).
+        Used by the UI when adding/testing an inbox.
+
+        Goes through the shared pool rather than a throwaway session, so
+        a successful probe leaves a warm authenticated connection behind —
+        saving the inbox and its first warm-up send skip the TLS handshake
+        and AUTH entirely — and re-testing an already-pooled inbox is just
+        a NOOP round trip.
+        """
+        try:
+            smtp, sends = _POOL.acquire(
+                self.host, self.port, self.email, self.password
+            )
+            _POOL.release(self.host, self.port, self.email, smtp, sends)
+            return True, "SMTP connection successful"
+        except smtplib.SMTPAuthenticationError:
+            return False, "Authentication failed — check your app password"
+        except smtplib.SMTPConnectError:
+            return False, f"Cannot connect to {self.host}:{self.port}"
+        except Exception as exc:
+            return False, str(exc)
@@ -0,0 +1,91 @@
+"""
+core/ui_events.py
+Bounded ring buffer for background-thread → UI event delivery.
+Replaces queue.Queue: overflow drops the *oldest* event (the UI would
+rather show fresh activity than ancient backlog), repeated status noise
+is coalesced, and the UI drains everything in one lock acquisition.
+"""
+import collections
+import threading
+
+# Event types where only the latest occurrence per inbox is interesting —
+# e.g. repeated "Scheduler started" or identical error storms.
+_COALESCE_TYPES = frozenset({"status", "error", "warning"})
+
+# Cosmetic traffic shed first on overflow — an error/pause/stage event
+# should never be pushed out by a storm of routine send notifications.
+_LOW_PRIORITY = frozenset({"send", "status"})
+
+
+class UIEventQueue:
+    """
+    Thread-safe bounded event buffer.
+    put_nowait() never blocks and never raises; drain() returns all
+    pending events at once. Duck-types the queue.Queue methods the
+    engines already call (put_nowait, qsize, empty).
+    """
+
+    def __init__(self, maxlen: int = 512) -> None:
+        # Overflow is handled in put_nowait rather than with deque's own
+        # maxlen, so shedding can pick a low-priority victim instead of
+        # blindly dropping whatever happens to be oldest.
+        self._events = collections.deque()
+        self._maxlen = maxlen
+        self._lock = threading.Lock()
+        self._wakeup = None
+
+    def set_wakeup(self, callback) -> None:
+        """Register a callable invoked after every put — on the producer's
+        thread — so the consumer can drain immediately instead of waiting
+        out a poll interval. The dashboard passes a thread-safe Tk wakeup;
+        pass None to unregister (e.g. during window teardown)."""
+        self._wakeup = callback
+
+    def put_nowait(self, event) -> None:
+        """Append an event (dict) or batch (list of dicts)."""
+        with self._lock:
+            ev = self._events
+            if ev and isinstance(event, dict):
+                last = ev[-1]
+                if (isinstance(last, dict)
+                        and event.get("type") in _COALESCE_TYPES
+                        and last.get("type") == event.get("type")
+                        and last.get("inbox") == event.get("inbox")):
+                    ev[-1] = event  # Coalesce duplicate status/error noise
+                    event = None
+            if event is not None:
+                ev.append(event)
+                if len(ev) > self._maxlen:
+                    self._shed_one()
+        wakeup = self._wakeup
+        if wakeup is not None:
+            try:
+                wakeup()
+            except Exception:
+                pass  # Consumer going away — the heartbeat still drains
+
+    def _shed_one(self) -> None:
+        """Drop one event to get back under maxlen: the oldest send/status
+        entry if there is one, else the oldest event outright.
+        Caller must hold _lock; only runs on overflow."""
+        for i, event in enumerate(self._events):
+            if (isinstance(event, dict)
+                    and event.get("type") in _LOW_PRIORITY):
+                del self._events[i]
+                return
+        self._events.popleft()
+
+    def drain(self) -> list:
+        """Remove and return all pending events under one lock."""
+        if not self._events:
+            return []
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+    def empty(self) -> bool:
+        return not self._events
@@ -4,10 +4,16 @@ Orchestrates warm-up email sending for all active inboxes.
 Called by the APScheduler tick every 60 seconds.
 Posts UI events to queue; never touches tkinter directly.
 """
-import queue
+import os
+import threading
 import time
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.ui_events import UIEventQueue
 
 from core.smtp_engine import SMTPEngine
 from core.content_generator import generate_email
@@ -15,11 +21,15 @@ from core.ramp_logic import (
     get_daily_limit,
     should_send,
     within_working_hours,
+    is_send_due,
     is_time_to_send,
+    schedule_next_send,
     check_bounce_threshold,
     next_stage,
+    working_window_seconds,
+    TokenBucket,
 )
-from core.logger import WarmupLogger
+from core.logger import WarmupLogger, timestamp_hms, timestamp_iso
 from storage.inbox_store import InboxStore, InboxRecord
 from storage.recipient_store import RecipientStore
 from storage.log_store import LogStore
@@ -27,11 +37,22 @@ from storage.log_store import LogStore
 logger = logging.getLogger("phoenix.warmup")
 
 
+@dataclass
+class SendJob:
+    """One prepared send: gates passed, recipient picked, content built."""
+    inbox: InboxRecord
+    recipient_email: str
+    recipient_name: str
+    subject: str
+    body: str
+
+
 class WarmupEngine:
     """
     Main warm-up orchestrator.
     run_cycle() is called by the scheduler every tick.
-    All SMTP network calls happen in the scheduler's background thread.
+    Per-inbox sends fan out across a worker pool; SMTP network calls
+    never happen on the UI thread.
     """
 
     def __init__(
@@ -39,13 +60,40 @@ class WarmupEngine:
         inbox_store: InboxStore,
         recipient_store: RecipientStore,
         log_store: LogStore,
-        ui_queue: queue.Queue,
+        ui_queue: "UIEventQueue",
     ) -> None:
         self.inbox_store = inbox_store
         self.recipient_store = recipient_store
         self.log_store = log_store
         self.ui_queue = ui_queue
+        # Flipped on by App once the dashboard exists; until then events are
+        # dropped before any dict/timestamp work or queue locking happens.
+        self.ui_queue_enabled = False
         self._warmup_logger = WarmupLogger(log_store)
+        # Next-send target per inbox email (epoch floats). Drawn once after
+        # each send; ticks then do a cheap time comparison instead of
+        # redrawing the random delay. Not persisted — after a restart the
+        # first check falls back to is_time_to_send on last_sent_at.
+        self._next_send_at: dict = {}
+        # One SMTPEngine per inbox — engines hold their pooled connection
+        # warm across ticks instead of rebuilding per send.
+        self._smtp_engines: dict = {}
+        # Token bucket per inbox: sustained rate = daily_limit over the
+        # working window, small burst for catch-up after gaps. Keyed by
+        # email, stored with the limit it was sized for so a stage
+        # promotion rebuilds it.
+        self._buckets: dict = {}
+        # Inboxes are independent SMTP sessions, so their sends fan out in
+        # parallel — the cycle would otherwise serialize one network
+        # round-trip per inbox. Kept modest: Zoho tolerates 5-10 sessions.
+        self._pool = ThreadPoolExecutor(
+            max_workers=int(os.environ.get("WARMUP_CONCURRENCY", "8")),
+            thread_name_prefix="warmup",
+        )
+        # UI events buffer per worker thread and flush as one list per
+        # inbox, so a burst of gates/sends takes the queue lock once
+        # instead of once per event.
+        self._ui_events = threading.local()
 
     # ------------------------------------------------------------------ #
     # Public scheduler entry point                                          #
@@ -53,14 +101,12 @@ class WarmupEngine:
 
     def run_cycle(self) -> None:
         """
-        Iterate all active inboxes. For each:
-          1. Check working hours gate
-          2. Check daily quota gate
-          3. Check send interval gate
-          4. Pick recipient and generate content
-          5. Send via SMTP
-          6. Update counters and logs
-          7. Check safety thresholds (bounce rate, errors)
+        Iterate all active inboxes in two phases:
+          prepare  — gates, recipient pick, content generation (serial,
+                     cheap, CSV-local)
+          dispatch — SMTP send + counter/log updates (parallel)
+        Preparing everything up front lets the store work for inbox N+1
+        overlap with the network wait of inbox N's send.
         """
         try:
             active = self.inbox_store.get_active()
@@ -68,77 +114,150 @@ class WarmupEngine:
             logger.error(f"Failed to load active inboxes: {exc}")
             return
 
+        if not active:
+            return
+
+        jobs = []
         for inbox in active:
             try:
-                self._process_inbox(inbox)
+                job = self._prepare(inbox)
             except Exception as exc:
-                logger.exception(f"Unhandled error for {inbox.email}: {exc}")
+                logger.exception(f"Prepare error for {inbox.email}: {exc}")
                 self._post_ui("error", inbox.email,
                               f"Unexpected error: {exc}")
+            else:
+                if job is not None:
+                    jobs.append(job)
+        self._flush_ui()
+
+        if not jobs:
+            return
+
+        # Block until the whole fan-out finishes so the scheduler's
+        # max_instances=1 guard still covers the in-flight work.
+        list(self._pool.map(self._dispatch_safe, jobs))
+
+    def _dispatch_safe(self, job: SendJob) -> None:
+        """Per-worker wrapper: errors never escape to the pool."""
+        try:
+            self._dispatch(job)
+        except Exception as exc:
+            logger.exception(f"Unhandled error for {job.inbox.email}: {exc}")
+            self._post_ui("error", job.inbox.email,
+                          f"Unexpected error: {exc}")
+        finally:
+            self._flush_ui()
 
     # ------------------------------------------------------------------ #
     # Private: per-inbox processing                                         #
     # ------------------------------------------------------------------ #
 
-    def _process_inbox(self, inbox: InboxRecord) -> None:
-        """Process one send attempt for one inbox."""
+    def _prepare(self, inbox: InboxRecord) -> "SendJob | None":
+        """Run the send gates and build the message for one inbox.
+        Returns None when any gate blocks the send."""
 
         # --- Gate 1: Working hours ---
         if not within_working_hours(
             inbox.working_hours_start, inbox.working_hours_end
         ):
-            return
+            return None
 
         # --- Gate 2: Daily limit ---
-        inbox_dict = {
-            "daily_sent": inbox.daily_sent,
-            "daily_limit": inbox.daily_limit,
-        }
-        if not should_send(inbox_dict):
-            return
+        if not should_send(inbox.daily_sent, inbox.daily_limit):
+            return None
 
         # --- Gate 3: Send interval ---
-        if not is_time_to_send(inbox.last_sent_at, inbox.stage):
-            return
+        next_at = self._next_send_at.get(inbox.email)
+        if next_at is not None:
+            if not is_send_due(next_at):
+                return None
+        elif not is_time_to_send(inbox.last_sent_at, inbox.stage):
+            return None
+
+        # --- Gate 4: Provider pacing ---
+        if not self._get_bucket(inbox).try_acquire():
+            return None
 
         # --- Pick recipient ---
         recipient = self.recipient_store.get_least_used(exclude_email=inbox.email)
         if recipient is None:
             logger.warning(f"No recipients available for {inbox.email}")
             self._post_ui("warning", inbox.email, "No recipients configured")
-            return
+            return None
+
+        # Record usage at pick time so later prepares in the same cycle
+        # don't all land on the same least-used recipient.
+        try:
+            self.recipient_store.record_use(recipient.email)
+        except Exception:
+            pass
 
         # --- Generate content ---
         content = generate_email(
-            sender_name=inbox.email.split("@")[0].replace(".", " ").title(),
+            sender_name=inbox.sender_display,
             recipient_name=recipient.name or recipient.email.split("@")[0],
         )
 
-        # --- Send ---
-        smtp = SMTPEngine(
-            host=inbox.smtp_host,
-            port=inbox.smtp_port,
-            email=inbox.email,
-            password=inbox.password,
-        )
-
-        result = smtp.send(
-            to_email=recipient.email,
-            to_name=recipient.name or "",
+        return SendJob(
+            inbox=inbox,
+            recipient_email=recipient.email,
+            recipient_name=recipient.name or "",
             subject=content.subject,
             body=content.body,
         )
 
-        # Update recipient usage regardless of outcome
-        try:
-            self.recipient_store.record_use(recipient.email)
-        except Exception:
-            pass
+    def _dispatch(self, job: SendJob) -> None:
+        """Send one prepared job via SMTP and persist the outcome."""
+        inbox = job.inbox
+        smtp = self._get_smtp_engine(inbox)
+
+        result = smtp.send(
+            to_email=job.recipient_email,
+            to_name=job.recipient_name,
+            subject=job.subject,
+            body=job.body,
+        )
 
         if result.success:
-            self._handle_success(inbox, recipient.email, content.subject)
+            self._handle_success(inbox, job.recipient_email, job.subject)
         else:
-            self._handle_failure(inbox, recipient.email, result)
+            self._handle_failure(inbox, job.recipient_email, result)
+
+    def _get_bucket(self, inbox: InboxRecord) -> TokenBucket:
+        """Return the pacing bucket for an inbox, rebuilding it when the
+        daily limit changes (stage promotion or manual edit)."""
+        entry = self._buckets.get(inbox.email)
+        if entry is not None and entry[1] == inbox.daily_limit:
+            return entry[0]
+        window = working_window_seconds(
+            inbox.working_hours_start, inbox.working_hours_end
+        )
+        bucket = TokenBucket(
+            rate=inbox.daily_limit / window,
+            burst=min(10, max(1, inbox.daily_limit // 10)),
+        )
+        self._buckets[inbox.email] = (bucket, inbox.daily_limit)
+        return bucket
+
+    def _get_smtp_engine(self, inbox: InboxRecord) -> SMTPEngine:
+        """Return the cached engine for an inbox, rebuilding it if the
+        stored credentials or host changed."""
+        engine = self._smtp_engines.get(inbox.email)
+        if engine is not None and (
+            engine.host != inbox.smtp_host
+            or engine.port != inbox.smtp_port
+            or engine.password != inbox.password
+        ):
+            engine = None
+        if engine is None:
+            engine = SMTPEngine(
+                host=inbox.smtp_host,
+                port=inbox.smtp_port,
+                email=inbox.email,
+                password=inbox.password,
+            )
+            self._smtp_engines[inbox.email] = engine
+        return engine
 
     # ------------------------------------------------------------------ #
     # Private: success / failure handling                                   #
@@ -164,28 +283,21 @@ class WarmupEngine:
                 f"{get_daily_limit(new_stage)}",
             )
 
-        # Persist updates
+        # Persist updates — only the fields a send actually changes
         try:
-            updated = InboxRecord(
+            self.inbox_store.update_after_send(
                 email=inbox.email,
-                smtp_host=inbox.smtp_host,
-                smtp_port=inbox.smtp_port,
-                imap_host=inbox.imap_host,
-                imap_port=inbox.imap_port,
-                password=inbox.password,
-                stage=new_stage,
                 daily_sent=new_sent,
+                stage=new_stage,
                 daily_limit=get_daily_limit(new_stage),
-                status=inbox.status,
-                last_sent_at=datetime.now().isoformat(timespec="seconds"),
-                paused_reason="",
-                working_hours_start=inbox.working_hours_start,
-                working_hours_end=inbox.working_hours_end,
+                last_sent_at=timestamp_iso(),
             )
-            self.inbox_store.update(updated)
         except Exception as exc:
             logger.error(f"Failed to update inbox after send: {exc}")
 
+        # Draw the next-send target once, now that a send actually happened
+        self._next_send_at[inbox.email] = schedule_next_send(new_stage)
+
         # Log and notify UI
         self._warmup_logger.send(inbox.email, to_email, subject)
         self._post_ui(
@@ -215,11 +327,7 @@ class WarmupEngine:
             # Check overall bounce rate
             bounces_24h = self.log_store.count_bounces_last_hours(inbox.email)
             sends_24h = self.log_store.count_sends_last_hours(inbox.email)
-            inbox_dict = {
-                "daily_sent": sends_24h,
-                "bounced_today": bounces_24h,
-            }
-            if check_bounce_threshold(inbox_dict):
+            if check_bounce_threshold(sends_24h, bounces_24h):
                 self.inbox_store.pause(
                     inbox.email,
                     f"Auto-paused: bounce rate exceeded threshold",
@@ -247,16 +355,30 @@ class WarmupEngine:
 
     def _post_ui(self, event_type: str, inbox_email: str, message: str) -> None:
         """
-        Push event to UI queue non-blocking.
-        Silently drops if queue is full.
+        Buffer an event on the worker's local list; _flush_ui posts the
+        whole list as one queue item at the end of the inbox's processing.
         event_type: send | reply | bounce | error | pause | stage_advance | warning
         """
-        try:
-            self.ui_queue.put_nowait({
-                "type": event_type,
-                "inbox": inbox_email,
-                "message": message,
-                "timestamp": datetime.now().strftime("%H:%M:%S"),
-            })
-        except queue.Full:
-            pass  # UI is slow; drop event rather than block
+        if not self.ui_queue_enabled:
+            return
+        buf = getattr(self._ui_events, "buf", None)
+        if buf is None:
+            buf = []
+            self._ui_events.buf = buf
+        buf.append((event_type, inbox_email, message))
+
+    def _flush_ui(self) -> None:
+        """Post the worker's buffered events as a single batch."""
+        buf = getattr(self._ui_events, "buf", None)
+        if not buf:
+            return
+        # One timestamp per batch — events from the same inbox pass land
+        # within the same second anyway.
+        ts = timestamp_hms()
+        events = [
+            {"type": t, "inbox": i, "message": m, "timestamp": ts}
+            for t, i, m in buf
+        ]
+        buf.clear()
+        # UIEventQueue never blocks or raises — overflow drops oldest.
+        self.ui_queue.put_nowait(events)
@@ -15,7 +15,7 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
+from apscheduler.events import EVENT_JOB_ERROR
 
 logger = logging.getLogger("phoenix.scheduler")
 
@@ -43,8 +43,14 @@ class WarmupScheduler:
         self._ui_queue = ui_queue
         self._running = False
 
+        # Separate executors per job class: a warmup cycle that spends its
+        # whole tick fanning out sends can no longer hold the worker a
+        # reply cycle or the midnight reset is waiting on. The engines
+        # parallelize internally, so two workers per class is plenty.
         executors = {
-            "default": ThreadPoolExecutor(max_workers=4),
+            "default": ThreadPoolExecutor(max_workers=2),
+            "warmup": ThreadPoolExecutor(max_workers=2),
+            "reply": ThreadPoolExecutor(max_workers=2),
         }
         job_defaults = {
             "coalesce": True,          # Merge missed runs into one
@@ -56,10 +62,9 @@ class WarmupScheduler:
             executors=executors,
             job_defaults=job_defaults,
         )
-        self._scheduler.add_listener(
-            self._on_job_event,
-            EVENT_JOB_ERROR | EVENT_JOB_EXECUTED,
-        )
+        # Errors only — the executed branch had no work to do, and success
+        # events outnumber failures by orders of magnitude.
+        self._scheduler.add_listener(self._on_job_event, EVENT_JOB_ERROR)
 
     # ------------------------------------------------------------------ #
     # Lifecycle                                                             #
@@ -76,6 +81,7 @@ class WarmupScheduler:
             trigger=IntervalTrigger(seconds=60),
             id=self.JOB_WARMUP,
             name="Warm-Up Send Cycle",
+            executor="warmup",
             replace_existing=True,
         )
 
@@ -85,6 +91,7 @@ class WarmupScheduler:
             trigger=IntervalTrigger(minutes=5),
             id=self.JOB_REPLY,
             name="IMAP Scan & Reply Cycle",
+            executor="reply",
             replace_existing=True,
         )
 
@@ -150,27 +157,30 @@ class WarmupScheduler:
     # ------------------------------------------------------------------ #
 
     def _on_job_event(self, event) -> None:
-        if hasattr(event, "exception") and event.exception:
-            logger.error(
-                f"Job {event.job_id} failed: {event.exception}",
-                exc_info=(
-                    type(event.exception),
-                    event.exception,
-                    event.exception.__traceback__,
-                ),
-            )
-            self._post_ui("error", "system",
-                          f"Job {event.job_id} error: {event.exception}")
+        # Registered for EVENT_JOB_ERROR only; the attribute is guaranteed
+        # on that event type, so no hasattr probing.
+        if event.exception is None:
+            return
+        logger.error(
+            f"Job {event.job_id} failed: {event.exception}",
+            exc_info=(
+                type(event.exception),
+                event.exception,
+                event.exception.__traceback__,
+            ),
+        )
+        self._post_ui("error", "system",
+                      f"Job {event.job_id} error: {event.exception}")
 
     def _post_ui(self, event_type: str, inbox: str, message: str) -> None:
         """Non-blocking post to UI queue."""
         try:
-            from datetime import datetime
+            from core.logger import timestamp_hms
             self._ui_queue.put_nowait({
                 "type": event_type,
                 "inbox": inbox,
                 "message": message,
-                "timestamp": datetime.now().strftime("%H:%M:%S"),
+                "timestamp": timestamp_hms(),
             })
         except Exception:
             pass
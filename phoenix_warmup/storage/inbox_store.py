@@ -1,213 +1,392 @@
-"""
-storage/inbox_store.py
-Thread-safe CRUD operations for inboxes.csv.
-Uses a module-level threading.Lock to prevent concurrent write corruption.
-"""
-import csv
-import threading
-from dataclasses import dataclass, asdict
-from datetime import datetime
-from pathlib import Path
-from typing import List, Optional
-
-# Resolve data directory (PyInstaller-safe)
-import sys
-
-def _get_data_dir() -> Path:
-    if getattr(sys, "frozen", False):
-        # Use the directory containing the .exe, not the read-only _MEIPASS bundle
-        base = Path(sys.executable).parent
-    else:
-        base = Path(__file__).parent.parent
-    d = base / "data"
-    d.mkdir(parents=True, exist_ok=True)
-    return d
-
-CSV_PATH = _get_data_dir() / "inboxes.csv"
-
-HEADERS = [
-    "email", "smtp_host", "smtp_port", "imap_host", "imap_port",
-    "password", "stage", "daily_sent", "daily_limit", "status",
-    "last_sent_at", "paused_reason", "working_hours_start", "working_hours_end",
-]
-
-_lock = threading.Lock()
-
-# Imported here to avoid a circular import (core does not import storage).
-from core.ramp_logic import STAGE_LIMITS  # noqa: E402
-
-
-@dataclass
-class InboxRecord:
-    email: str
-    smtp_host: str = "smtp.zoho.in"
-    smtp_port: int = 587
-    imap_host: str = "imap.zoho.in"
-    imap_port: int = 993
-    password: str = ""
-    stage: int = 1
-    daily_sent: int = 0
-    daily_limit: int = 5
-    status: str = "active"          # active | paused | error | warming
-    last_sent_at: str = ""
-    paused_reason: str = ""
-    working_hours_start: str = "08:00"
-    working_hours_end: str = "18:00"
-
-    def __post_init__(self):
-        # Safely coerce CSV string values to int with fallback defaults.
-        # int("") raises ValueError, so guard against empty/missing columns.
-        def _int(v, default: int) -> int:
-            try:
-                return int(v)
-            except (ValueError, TypeError):
-                return default
-
-        self.smtp_port  = _int(self.smtp_port,  587)
-        self.imap_port  = _int(self.imap_port,  993)
-        self.stage      = _int(self.stage,       1)
-        self.daily_sent = _int(self.daily_sent,  0)
-        self.daily_limit= _int(self.daily_limit, 5)
-
-
-class InboxStore:
-    """Thread-safe CSV-backed store for inbox accounts."""
-
-    # ------------------------------------------------------------------ #
-    # Private helpers                                                       #
-    # ------------------------------------------------------------------ #
-
-    def _ensure_file(self) -> None:
-        """Create CSV with header row if it doesn't exist."""
-        if not CSV_PATH.exists():
-            with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=HEADERS)
-                writer.writeheader()
-
-    def _read_raw(self) -> List[dict]:
-        """Read all rows as plain dicts. Caller MUST hold _lock."""
-        self._ensure_file()
-        with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
-            return list(csv.DictReader(f))
-
-    def _write_raw(self, rows: List[dict]) -> None:
-        """Overwrite CSV with given rows. Caller MUST hold _lock."""
-        with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=HEADERS)
-            writer.writeheader()
-            writer.writerows(rows)
-
-    def _row_to_record(self, row: dict) -> InboxRecord:
-        return InboxRecord(**{k: row.get(k, "") for k in HEADERS})
-
-    # ------------------------------------------------------------------ #
-    # Public API                                                            #
-    # ------------------------------------------------------------------ #
-
-    def get_all(self) -> List[InboxRecord]:
-        with _lock:
-            rows = self._read_raw()
-        return [self._row_to_record(r) for r in rows]
-
-    def get_active(self) -> List[InboxRecord]:
-        return [r for r in self.get_all() if r.status == "active"]
-
-    def find(self, email: str) -> Optional[InboxRecord]:
-        for r in self.get_all():
-            if r.email == email:
-                return r
-        return None
-
-    def add(self, record: InboxRecord) -> None:
-        with _lock:
-            rows = self._read_raw()
-            if any(r["email"] == record.email for r in rows):
-                raise ValueError(f"Inbox {record.email!r} already exists.")
-            rows.append(asdict(record))
-            self._write_raw(rows)
-
-    def update(self, record: InboxRecord) -> None:
-        with _lock:
-            rows = self._read_raw()
-            updated = False
-            for i, row in enumerate(rows):
-                if row["email"] == record.email:
-                    rows[i] = asdict(record)
-                    updated = True
-                    break
-            if not updated:
-                raise KeyError(f"Inbox {record.email!r} not found.")
-            self._write_raw(rows)
-
-    def delete(self, email: str) -> None:
-        with _lock:
-            rows = self._read_raw()
-            rows = [r for r in rows if r["email"] != email]
-            self._write_raw(rows)
-
-    def pause(self, email: str, reason: str = "") -> None:
-        """Atomically set inbox status to paused within a single lock."""
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                if row["email"] == email:
-                    row["status"] = "paused"
-                    row["paused_reason"] = reason
-                    break
-            self._write_raw(rows)
-
-    def resume(self, email: str) -> None:
-        """Atomically set inbox status back to active within a single lock."""
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                if row["email"] == email:
-                    row["status"] = "active"
-                    row["paused_reason"] = ""
-                    break
-            self._write_raw(rows)
-
-    def increment_daily_sent(self, email: str) -> None:
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                if row["email"] == email:
-                    row["daily_sent"] = int(row.get("daily_sent", 0)) + 1
-                    row["last_sent_at"] = datetime.now().isoformat(timespec="seconds")
-                    break
-            self._write_raw(rows)
-
-    def increment_daily_replied(self, email: str) -> None:
-        """Track replies in last_sent_at field; extend schema if needed."""
-        # Replies don't have a separate counter in the schema; we log via log_store.
-        pass
-
-    def reset_daily_counts(self) -> None:
-        """Called at midnight by the scheduler."""
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                row["daily_sent"] = 0
-            self._write_raw(rows)
-
-    def update_stage(self, email: str, new_stage: int) -> None:
-        """Atomically update stage and daily_limit within a single lock."""
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                if row["email"] == email:
-                    row["stage"] = str(new_stage)
-                    row["daily_limit"] = str(STAGE_LIMITS.get(new_stage, 5))
-                    break
-            self._write_raw(rows)
-
-    def mark_error(self, email: str, reason: str) -> None:
-        """Atomically mark inbox as errored within a single lock."""
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                if row["email"] == email:
-                    row["status"] = "error"
-                    row["paused_reason"] = reason
-                    break
-            self._write_raw(rows)
+"""
+storage/inbox_store.py
+Thread-safe CRUD operations for inboxes.csv.
+Uses a module-level threading.Lock to prevent concurrent write corruption.
+"""
+import csv
+import functools
+import operator
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+# Resolve data directory (PyInstaller-safe)
+import sys
+
+def _get_data_dir() -> Path:
+    if getattr(sys, "frozen", False):
+        # Use the directory containing the .exe, not the read-only _MEIPASS bundle
+        base = Path(sys.executable).parent
+    else:
+        base = Path(__file__).parent.parent
+    d = base / "data"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+CSV_PATH = _get_data_dir() / "inboxes.csv"
+# Write-ahead journal: single-field mutations append one line here instead
+# of rewriting the whole CSV. Folded back into inboxes.csv whenever a
+# full-file write happens (add/update/delete/reset) — see _apply_journal.
+JOURNAL_PATH = _get_data_dir() / "inboxes.journal"
+# Cached append handle for the journal (opened lazily by _journal_append)
+_journal_file = None
+
+HEADERS = [
+    "email", "smtp_host", "smtp_port", "imap_host", "imap_port",
+    "password", "stage", "daily_sent", "daily_limit", "status",
+    "last_sent_at", "paused_reason", "working_hours_start", "working_hours_end",
+]
+
+_lock = threading.Lock()
+
+# Create the CSV once at import so the read/write paths don't stat for
+# existence on every call; deletion at runtime is handled where it's read.
+try:
+    if not CSV_PATH.exists():
+        with open(CSV_PATH, "w", newline="", encoding="utf-8") as _f:
+            csv.DictWriter(_f, fieldnames=HEADERS).writeheader()
+except OSError:
+    pass
+
+# Bumped on every write. Lets readers cache derived views (e.g. the
+# active-inbox list) and revalidate with an integer compare instead of
+# re-reading and re-parsing the CSV each scheduler tick.
+_version = 0
+
+# Column accessors built once — row (de)serialization walks these
+# instead of asdict()'s reflection or a per-row dict comprehension.
+_TO_ROW = operator.attrgetter(*HEADERS)
+_FROM_ROW = operator.itemgetter(*HEADERS)
+
+# Imported here to avoid a circular import (core does not import storage).
+from core.ramp_logic import STAGE_LIMITS  # noqa: E402
+from storage.log_store import _file_lock, _now_iso_seconds  # noqa: E402
+
+
+@dataclass
+class InboxRecord:
+    email: str
+    smtp_host: str = "smtp.zoho.in"
+    smtp_port: int = 587
+    imap_host: str = "imap.zoho.in"
+    imap_port: int = 993
+    password: str = ""
+    stage: int = 1
+    daily_sent: int = 0
+    daily_limit: int = 5
+    status: str = "active"          # active | paused | error | warming
+    last_sent_at: str = ""
+    paused_reason: str = ""
+    working_hours_start: str = "08:00"
+    working_hours_end: str = "18:00"
+
+    def __post_init__(self):
+        # Safely coerce CSV string values to int with fallback defaults.
+        # int("") raises ValueError, so guard against empty/missing columns.
+        def _int(v, default: int) -> int:
+            try:
+                return int(v)
+            except (ValueError, TypeError):
+                return default
+
+        self.smtp_port  = _int(self.smtp_port,  587)
+        self.imap_port  = _int(self.imap_port,  993)
+        self.stage      = _int(self.stage,       1)
+        self.daily_sent = _int(self.daily_sent,  0)
+        self.daily_limit= _int(self.daily_limit, 5)
+
+    @functools.cached_property
+    def sender_display(self) -> str:
+        """Display name derived from the address local part
+        (e.g. 'john.doe@x.com' → 'John Doe'). Cached — the engines ask
+        for it on every send. Not a CSV column (_to_row ignores it)."""
+        return self.email.split("@")[0].replace(".", " ").title()
+
+    def _to_row(self) -> dict:
+        """Serialize to a CSV row dict via the precomputed attrgetter —
+        no reflection. (This class keeps __dict__ for the cached
+        property above, so slots=True isn't an option here.)"""
+        return dict(zip(HEADERS, _TO_ROW(self)))
+
+
+class InboxStore:
+    """Thread-safe CSV-backed store for inbox accounts."""
+
+    # ------------------------------------------------------------------ #
+    # Private helpers                                                       #
+    # ------------------------------------------------------------------ #
+
+    def _ensure_file(self) -> None:
+        """Create CSV with header row if it doesn't exist."""
+        if not CSV_PATH.exists():
+            with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=HEADERS)
+                writer.writeheader()
+
+    def _read_raw(self) -> List[dict]:
+        """Read all rows as plain dicts, with journal entries applied.
+        Parsed rows are cached keyed by the store version (_version is
+        bumped by journal appends too, which a CSV-mtime check would
+        miss), so repeat reads between writes are a dict copy instead of
+        a parse. Caller MUST hold _lock."""
+        cached = getattr(self, "_rows_cache", None)
+        if cached is not None and cached[0] == _version:
+            return list(cached[1].values())
+        try:
+            with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        except FileNotFoundError:
+            # File vanished at runtime — recreate and carry on empty
+            self._ensure_file()
+            rows = []
+        rows = self._apply_journal(rows)
+        self._rows_cache = (_version, {row["email"]: row for row in rows})
+        return rows
+
+    def _write_raw(self, rows: List[dict]) -> None:
+        """Overwrite CSV with given rows and truncate the journal (rows
+        from _read_raw already have it applied). Writes go to a temp
+        file committed with os.replace, so a crash mid-write leaves the
+        old file intact instead of a torn one. Caller MUST hold _lock."""
+        global _version
+        tmp = CSV_PATH.with_suffix(".csv.tmp")
+        with _file_lock(CSV_PATH):
+            with open(tmp, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=HEADERS)
+                writer.writeheader()
+                writer.writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, CSV_PATH)
+            if JOURNAL_PATH.exists():
+                open(JOURNAL_PATH, "w").close()
+        _version += 1
+
+    def _journal_append(self, entries: List[tuple]) -> None:
+        """Append (email, op, field, value) mutations to the journal —
+        one O(1) write instead of a full CSV rewrite. op is 'set' or
+        'incr'. The append handle is opened once and kept (this path
+        runs on every send; open/close would cost more than the write
+        itself). O_APPEND semantics keep it valid across truncation in
+        _write_raw. Caller MUST hold _lock."""
+        global _version, _journal_file
+        if _journal_file is None:
+            _journal_file = open(JOURNAL_PATH, "a", encoding="utf-8")
+        lines = []
+        for email, op, field, value in entries:
+            value = str(value).replace("\t", " ").replace("\n", " ")
+            lines.append(f"{email}\t{op}\t{field}\t{value}\n")
+        with _file_lock(CSV_PATH):
+            _journal_file.write("".join(lines))
+            # Flush so _apply_journal (which reads the file) sees every entry
+            _journal_file.flush()
+        _version += 1
+
+    def _apply_journal(self, rows: List[dict]) -> List[dict]:
+        """Overlay journal mutations onto freshly parsed CSV rows.
+        Caller MUST hold _lock."""
+        try:
+            lines = JOURNAL_PATH.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return rows
+        if not lines:
+            return rows
+        index = {row["email"]: row for row in rows}
+        for line in lines:
+            parts = line.split("\t")
+            if len(parts) != 4:
+                continue
+            email, op, field, value = parts
+            row = index.get(email)
+            if row is None or field not in HEADERS:
+                continue
+            if op == "incr":
+                try:
+                    row[field] = str(int(row.get(field) or 0) + int(value))
+                except ValueError:
+                    pass
+            else:
+                row[field] = value
+        return rows
+
+    def compact(self) -> None:
+        """Fold outstanding journal entries back into inboxes.csv."""
+        with _lock:
+            self._write_raw(self._read_raw())
+
+    def _row_to_record(self, row: dict) -> InboxRecord:
+        try:
+            # Positional: HEADERS order matches the dataclass field order
+            return InboxRecord(*_FROM_ROW(row))
+        except KeyError:
+            # Row from an older file missing newer columns
+            return InboxRecord(**{k: row.get(k, "") for k in HEADERS})
+
+    def _revalidate_disk(self) -> None:
+        """Detect out-of-band edits to inboxes.csv (the user touching the
+        file while the app runs) and fold them into the version-keyed
+        caches by bumping _version. One stat call on the read fast
+        paths — the version counter otherwise only tracks writes made
+        through this process."""
+        global _version
+        try:
+            st = os.stat(CSV_PATH)
+        except OSError:
+            return
+        sig = (st.st_mtime_ns, st.st_size)
+        if sig != getattr(self, "_disk_sig", None):
+            if getattr(self, "_disk_sig", None) is not None:
+                _version += 1
+            self._disk_sig = sig
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                            #
+    # ------------------------------------------------------------------ #
+
+    def get_all(self) -> List[InboxRecord]:
+        self._revalidate_disk()
+        # Lock-free fast path: _rows_cache is an immutable (version, index)
+        # tuple swapped in atomically, so a reader can serve the last
+        # committed snapshot without blocking on a concurrent writer —
+        # at worst it sees the state from just before that write.
+        cached = getattr(self, "_rows_cache", None)
+        if cached is not None and cached[0] == _version:
+            rows = list(cached[1].values())
+        else:
+            with _lock:
+                rows = self._read_raw()
+        return [self._row_to_record(r) for r in rows]
+
+    def get_version(self) -> int:
+        """Current write-version of the store (bumped by every write)."""
+        return _version
+
+    def get_active(self) -> List[InboxRecord]:
+        """Active inboxes, cached until the next write. Warmup and reply
+        cycles both ask for this list every tick; when nothing changed
+        the answer is a stat plus an integer compare instead of a CSV
+        parse."""
+        self._revalidate_disk()
+        version = _version
+        cached = getattr(self, "_active_cache", None)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        active = [r for r in self.get_all() if r.status == "active"]
+        self._active_cache = (version, active)
+        return active
+
+    def find(self, email: str) -> Optional[InboxRecord]:
+        """O(1) lookup against the cached email→row index — no linear
+        scan, and no parse (or lock) at all when the store hasn't
+        changed; see get_all for the snapshot-read rationale."""
+        self._revalidate_disk()
+        cached = getattr(self, "_rows_cache", None)
+        if cached is None or cached[0] != _version:
+            with _lock:
+                self._read_raw()  # revalidates _rows_cache
+            cached = self._rows_cache
+        row = cached[1].get(email)
+        return self._row_to_record(row) if row is not None else None
+
+    def add(self, record: InboxRecord) -> None:
+        with _lock:
+            rows = self._read_raw()
+            if any(r["email"] == record.email for r in rows):
+                raise ValueError(f"Inbox {record.email!r} already exists.")
+            rows.append(record._to_row())
+            self._write_raw(rows)
+
+    def update(self, record: InboxRecord) -> None:
+        with _lock:
+            rows = self._read_raw()
+            updated = False
+            for i, row in enumerate(rows):
+                if row["email"] == record.email:
+                    rows[i] = record._to_row()
+                    updated = True
+                    break
+            if not updated:
+                raise KeyError(f"Inbox {record.email!r} not found.")
+            self._write_raw(rows)
+
+    def delete(self, email: str) -> None:
+        with _lock:
+            rows = self._read_raw()
+            rows = [r for r in rows if r["email"] != email]
+            self._write_raw(rows)
+
+    def pause(self, email: str, reason: str = "") -> None:
+        """Mark inbox paused — one journal append, no CSV rewrite."""
+        with _lock:
+            self._journal_append([
+                (email, "set", "status", "paused"),
+                (email, "set", "paused_reason", reason),
+            ])
+
+    def resume(self, email: str) -> None:
+        """Mark inbox active again — one journal append, no CSV rewrite."""
+        with _lock:
+            self._journal_append([
+                (email, "set", "status", "active"),
+                (email, "set", "paused_reason", ""),
+            ])
+
+    def update_after_send(
+        self,
+        email: str,
+        daily_sent: int,
+        stage: int,
+        daily_limit: int,
+        last_sent_at: str,
+    ) -> None:
+        """Atomically update just the post-send fields for one inbox.
+        Cheaper than update() at the call site (no full InboxRecord
+        reconstruction) and stale fields from the caller's snapshot
+        can't clobber concurrent edits to the other columns."""
+        with _lock:
+            self._journal_append([
+                (email, "set", "daily_sent", daily_sent),
+                (email, "set", "stage", stage),
+                (email, "set", "daily_limit", daily_limit),
+                (email, "set", "last_sent_at", last_sent_at),
+                (email, "set", "paused_reason", ""),
+            ])
+
+    def increment_daily_sent(self, email: str) -> None:
+        with _lock:
+            self._journal_append([
+                (email, "incr", "daily_sent", 1),
+                (email, "set", "last_sent_at", _now_iso_seconds()),
+            ])
+
+    def increment_daily_replied(self, email: str) -> None:
+        """Track replies in last_sent_at field; extend schema if needed."""
+        # Replies don't have a separate counter in the schema; we log via log_store.
+        pass
+
+    def reset_daily_counts(self) -> None:
+        """Called at midnight by the scheduler. The full-file write doubles
+        as journal compaction for the day's accumulated mutations."""
+        with _lock:
+            # Copy rows rather than zeroing the cached dicts in place —
+            # lock-free snapshot readers may still hold them.
+            rows = [{**row, "daily_sent": 0} for row in self._read_raw()]
+            self._write_raw(rows)
+
+    def update_stage(self, email: str, new_stage: int) -> None:
+        """Advance stage/daily_limit — one journal append."""
+        with _lock:
+            self._journal_append([
+                (email, "set", "stage", new_stage),
+                (email, "set", "daily_limit", STAGE_LIMITS.get(new_stage, 5)),
+            ])
+
+    def mark_error(self, email: str, reason: str) -> None:
+        """Mark inbox errored — one journal append."""
+        with _lock:
+            self._journal_append([
+                (email, "set", "status", "error"),
+                (email, "set", "paused_reason", reason),
+            ])
@@ -1,136 +1,354 @@
-"""
-storage/log_store.py
-Append-only thread-safe CSV log store.
-Rows are never deleted; only appended or queried.
-"""
-import csv
-import threading
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List
-import sys
-
-
-def _get_data_dir() -> Path:
-    if getattr(sys, "frozen", False):
-        base = Path(sys.executable).parent
-    else:
-        base = Path(__file__).parent.parent
-    d = base / "data"
-    d.mkdir(parents=True, exist_ok=True)
-    return d
-
-
-CSV_PATH = _get_data_dir() / "logs.csv"
-
-HEADERS = [
-    "timestamp", "inbox_email", "event_type",
-    "recipient", "subject", "details",
-]
-
-_lock = threading.Lock()
-
-
-@dataclass
-class LogRecord:
-    timestamp: str
-    inbox_email: str
-    event_type: str          # SEND | REPLY | BOUNCE | ERROR | PAUSE | RESET | STAGE
-    recipient: str = ""
-    subject: str = ""
-    details: str = ""
-
-    @classmethod
-    def now(cls, inbox_email: str, event_type: str, **kwargs) -> "LogRecord":
-        return cls(
-            timestamp=datetime.now().isoformat(timespec="seconds"),
-            inbox_email=inbox_email,
-            event_type=event_type,
-            **kwargs,
-        )
-
-
-class LogStore:
-    """Append-only CSV log. Thread-safe via threading.Lock."""
-
-    def _ensure_file(self) -> None:
-        if not CSV_PATH.exists():
-            with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=HEADERS)
-                writer.writeheader()
-
-    def append(self, record: LogRecord) -> None:
-        with _lock:
-            self._ensure_file()
-            file_empty = CSV_PATH.stat().st_size == 0
-            with open(CSV_PATH, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=HEADERS)
-                if file_empty:
-                    writer.writeheader()
-                writer.writerow(asdict(record))
-
-    def get_recent(self, n: int = 200) -> List[LogRecord]:
-        with _lock:
-            self._ensure_file()
-            with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
-                rows = list(csv.DictReader(f))
-        return [self._row_to_record(r) for r in rows[-n:]]
-
-    def get_today_stats(self) -> dict:
-        """Return totals for SEND, REPLY, ERROR events today."""
-        today = datetime.now().date().isoformat()
-        stats = {"sends": 0, "replies": 0, "errors": 0, "bounces": 0}
-        with _lock:
-            self._ensure_file()
-            with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    if row.get("timestamp", "").startswith(today):
-                        et = row.get("event_type", "")
-                        if et == "SEND":
-                            stats["sends"] += 1
-                        elif et == "REPLY":
-                            stats["replies"] += 1
-                        elif et == "ERROR":
-                            stats["errors"] += 1
-                        elif et == "BOUNCE":
-                            stats["bounces"] += 1
-        return stats
-
-    def count_bounces_last_hours(self, inbox_email: str, hours: int = 24) -> int:
-        """Count hard bounces for a specific inbox in the last N hours."""
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-        count = 0
-        with _lock:
-            self._ensure_file()
-            with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    if (row.get("inbox_email") == inbox_email
-                            and row.get("event_type") == "BOUNCE"
-                            and row.get("timestamp", "") >= cutoff):
-                        count += 1
-        return count
-
-    def count_sends_last_hours(self, inbox_email: str, hours: int = 24) -> int:
-        """Count successful sends for a specific inbox in the last N hours."""
-        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-        count = 0
-        with _lock:
-            self._ensure_file()
-            with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    if (row.get("inbox_email") == inbox_email
-                            and row.get("event_type") == "SEND"
-                            and row.get("timestamp", "") >= cutoff):
-                        count += 1
-        return count
-
-    def _row_to_record(self, row: dict) -> LogRecord:
-        return LogRecord(
-            timestamp=row.get("timestamp", ""),
-            inbox_email=row.get("inbox_email", ""),
-            event_type=row.get("event_type", ""),
-            recipient=row.get("recipient", ""),
-            subject=row.get("subject", ""),
-            details=row.get("details", ""),
-        )
+"""
+storage/log_store.py
+Append-only thread-safe CSV log store.
+Rows are never deleted; only appended or queried.
+"""
+import atexit
+import collections
+import contextlib
+import csv
+import io
+import os
+import threading
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+import sys
+
+
+def _get_data_dir() -> Path:
+    if getattr(sys, "frozen", False):
+        base = Path(sys.executable).parent
+    else:
+        base = Path(__file__).parent.parent
+    d = base / "data"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+CSV_PATH = _get_data_dir() / "logs.csv"
+
+HEADERS = [
+    "timestamp", "inbox_email", "event_type",
+    "recipient", "subject", "details",
+]
+
+_lock = threading.Lock()
+
+# csv.writer's default dialect: CRLF row terminator, quote only when needed
+_HEADER_LINE = ",".join(HEADERS) + "\r\n"
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """OS-level advisory lock on <path>.lock, serializing writers across
+    processes (a second instance pointed at the same data dir) — the
+    module threading.Lock only covers threads inside this one. Held just
+    for the duration of a write."""
+    with open(str(path) + ".lock", "w") as lf:
+        try:
+            if os.name == "nt":
+                msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+            yield
+        finally:
+            try:
+                if os.name == "nt":
+                    lf.seek(0)
+                    msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+            except OSError:
+                pass
+
+
+_last_ts_sec = -1
+_last_ts_str = ""
+
+
+def _now_iso_seconds() -> str:
+    """datetime.now().isoformat(timespec="seconds"), with the formatted
+    string cached per wall-clock second. Log events arrive in bursts, so
+    most calls reduce to a clock read and an int compare. Same idea as
+    core.logger's timestamp cache, duplicated here because core.logger
+    imports this module."""
+    global _last_ts_sec, _last_ts_str
+    sec = int(time.time())
+    if sec != _last_ts_sec:
+        _last_ts_str = time.strftime("%Y-%m-%dT%H:%M:%S",
+                                     time.localtime(sec))
+        _last_ts_sec = sec
+    return _last_ts_str
+
+
+def _quote(s: str) -> str:
+    """Quote a CSV field only when it actually needs escaping."""
+    if '"' in s or "," in s or "\n" in s or "\r" in s:
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+
+def _format_line(r: "LogRecord") -> str:
+    """Render one record as a CSV line without the csv module. The first
+    three fields (ISO timestamp, email, event token) can never contain
+    separators; the free-text fields get the one-shot quote check."""
+    return (f"{r.timestamp},{r.inbox_email},{r.event_type},"
+            f"{_quote(r.recipient)},{_quote(r.subject)},{_quote(r.details)}\r\n")
+
+
+@dataclass(slots=True)
+class LogRecord:
+    timestamp: str
+    inbox_email: str
+    event_type: str          # SEND | REPLY | BOUNCE | ERROR | PAUSE | RESET | STAGE
+    recipient: str = ""
+    subject: str = ""
+    details: str = ""
+
+    @classmethod
+    def now(cls, inbox_email: str, event_type: str, **kwargs) -> "LogRecord":
+        return cls(
+            timestamp=_now_iso_seconds(),
+            inbox_email=inbox_email,
+            event_type=event_type,
+            **kwargs,
+        )
+
+
+class LogStore:
+    """
+    Append-only CSV log. Thread-safe via threading.Lock.
+    append() only enqueues onto an in-memory deque; a daemon writer
+    thread drains the queue with one writerows() call per burst, so the
+    hot logging path never opens the file. Readers flush first, so they
+    always see the latest events.
+    """
+
+    FLUSH_DELAY = 0.2     # seconds a burst may accumulate before writing
+    RETENTION_HOURS = 24  # rolling-counter window (the widest query used)
+
+    def __init__(self) -> None:
+        self._queue: collections.deque = collections.deque()
+        self._wake = threading.Event()
+        self._fd: int = -1  # cached O_APPEND descriptor (see _append_fd)
+        # Rolling counters so stats queries never re-scan the CSV: today's
+        # event totals plus per-inbox timestamp deques for the SEND/BOUNCE
+        # rate checks. Rebuilt from the last 24h of the file at startup,
+        # then kept current by append()/append_many().
+        self._stats_lock = threading.Lock()
+        self._stats_date = datetime.now().date().isoformat()
+        self._stats_today: collections.Counter = collections.Counter()
+        self._sends_by_inbox: dict = collections.defaultdict(collections.deque)
+        self._bounces_by_inbox: dict = collections.defaultdict(collections.deque)
+        self._replay_counters()
+        atexit.register(self.flush)
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="logstore-writer", daemon=True,
+        )
+        self._writer.start()
+
+    def _ensure_file(self) -> None:
+        if not CSV_PATH.exists():
+            with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=HEADERS)
+                writer.writeheader()
+
+    def _append_fd(self) -> int:
+        """Cached file descriptor for the append path, opened once with
+        O_APPEND — a flush is then a single os.write instead of
+        open/stat/write/close every burst. O_CREAT covers the first run;
+        the header is prepended when fstat reports an empty file."""
+        if self._fd < 0:
+            self._fd = os.open(
+                str(CSV_PATH),
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644,
+            )
+        return self._fd
+
+    def _writer_loop(self) -> None:
+        self._ensure_file()
+        while True:
+            self._wake.wait()
+            # Let the burst accumulate so one open/write covers it all
+            time.sleep(self.FLUSH_DELAY)
+            self._wake.clear()
+            self.flush()
+
+    def _replay_counters(self) -> None:
+        """Rebuild the rolling counters from the last 24h of logs.csv.
+        One O(N) scan at construction buys O(1) stats queries after.
+
+        Only the first three columns matter here, and none of them can
+        contain a comma or quote (ISO timestamp, email address, event
+        token), so plain str.split beats csv.DictReader's per-row dict
+        allocation — the ISO-shape check also skips continuation lines
+        from a quoted multi-line details field.
+        """
+        if not CSV_PATH.exists():
+            return
+        cutoff = (datetime.now()
+                  - timedelta(hours=self.RETENTION_HOURS)).isoformat()
+        with open(CSV_PATH, "r", encoding="utf-8") as f:
+            next(f, None)  # header
+            for line in f:
+                parts = line.split(",", 3)
+                if len(parts) < 3:
+                    continue
+                ts = parts[0]
+                # Real rows start with an ISO timestamp (YYYY-MM-DDTHH:MM:SS)
+                if len(ts) != 19 or ts[4] != "-" or ts < cutoff:
+                    continue
+                self._track(ts, parts[1], parts[2])
+
+    def _track(self, timestamp: str, inbox_email: str, event_type: str) -> None:
+        """Fold one event into the rolling counters.
+        Caller MUST hold _stats_lock (or be in single-threaded __init__)."""
+        if timestamp.startswith(self._stats_date):
+            self._stats_today[event_type] += 1
+        elif timestamp[:10] > self._stats_date:
+            # Midnight rolled over since the last event
+            self._stats_date = timestamp[:10]
+            self._stats_today = collections.Counter({event_type: 1})
+        if event_type == "SEND":
+            self._sends_by_inbox[inbox_email].append(timestamp)
+        elif event_type == "BOUNCE":
+            self._bounces_by_inbox[inbox_email].append(timestamp)
+
+    def _expire(self, timestamps: collections.deque) -> None:
+        """Drop entries older than the retention window from the front.
+        Caller MUST hold _stats_lock."""
+        cutoff = (datetime.now()
+                  - timedelta(hours=self.RETENTION_HOURS)).isoformat()
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
+
+    def append(self, record: LogRecord) -> None:
+        """Enqueue one record — no file I/O on the caller's thread."""
+        self._queue.append(record)
+        with self._stats_lock:
+            self._track(record.timestamp, record.inbox_email,
+                        record.event_type)
+        self._wake.set()
+
+    def append_many(self, records: List[LogRecord]) -> None:
+        """Enqueue a batch of records — no file I/O on the caller's thread."""
+        if not records:
+            return
+        self._queue.extend(records)
+        with self._stats_lock:
+            for record in records:
+                self._track(record.timestamp, record.inbox_email,
+                            record.event_type)
+        self._wake.set()
+
+    def flush(self) -> None:
+        """Drain buffered records to disk. Safe to call from any thread;
+        also registered with atexit so shutdown loses nothing."""
+        if not self._queue:
+            return
+        with _lock:
+            batch = []
+            try:
+                while True:
+                    batch.append(self._queue.popleft())
+            except IndexError:
+                pass
+            if not batch:
+                return
+            fd = self._append_fd()
+            # Preformatted lines — one encode and one os.write per burst,
+            # no DictWriter/asdict machinery in between
+            text = "".join(map(_format_line, batch))
+            if os.fstat(fd).st_size == 0:
+                text = _HEADER_LINE + text
+            os.write(fd, text.encode("utf-8"))
+
+    def _tail_rows(self, n: int) -> List[list]:
+        """Parse roughly the last n CSV rows by reading backwards from
+        EOF in growing blocks, so a multi-megabyte log costs the same as
+        a small one. The window widens until it holds n complete rows
+        (or the whole file); cutting at the first newline and requiring
+        an ISO-shaped timestamp drops the torn leading row, the header,
+        and continuation lines of quoted multi-line fields.
+        Caller MUST hold _lock."""
+        try:
+            size = CSV_PATH.stat().st_size
+        except FileNotFoundError:
+            return []
+        span = 8192
+        while True:
+            span = min(span, size)
+            with open(CSV_PATH, "rb") as f:
+                f.seek(size - span)
+                data = f.read(span)
+            if span < size:
+                nl = data.find(b"\n")
+                data = data[nl + 1:] if nl != -1 else b""
+            text = data.decode("utf-8", errors="replace")
+            rows = [
+                r for r in csv.reader(io.StringIO(text))
+                if len(r) == 6 and len(r[0]) == 19 and r[0][4] == "-"
+            ]
+            if len(rows) >= n or span == size:
+                return rows[-n:]
+            span *= 4
+
+    def get_recent(self, n: int = 200) -> List[LogRecord]:
+        self.flush()
+        with _lock:
+            rows = self._tail_rows(n)
+        # Positional construction — csv.reader yields lists in HEADERS
+        # order, so no per-row dict allocation or keyed lookups
+        return [LogRecord(*row) for row in rows]
+
+    def get_today_stats(self) -> dict:
+        """Return totals for SEND, REPLY, ERROR events today.
+        Served from the rolling counters — no CSV scan."""
+        today = datetime.now().date().isoformat()
+        with self._stats_lock:
+            if today != self._stats_date:
+                # Midnight passed with no events logged since
+                self._stats_date = today
+                self._stats_today = collections.Counter()
+            return {
+                "sends": self._stats_today["SEND"],
+                "replies": self._stats_today["REPLY"],
+                "errors": self._stats_today["ERROR"],
+                "bounces": self._stats_today["BOUNCE"],
+            }
+
+    def _count_last_hours(self, timestamps_by_inbox: dict,
+                          inbox_email: str, hours: int) -> int:
+        """Count tracked events newer than the cutoff for one inbox.
+        O(matches) against an in-memory deque instead of a file scan."""
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        with self._stats_lock:
+            timestamps = timestamps_by_inbox.get(inbox_email)
+            if not timestamps:
+                return 0
+            self._expire(timestamps)
+            if hours >= self.RETENTION_HOURS:
+                return len(timestamps)
+            count = 0
+            for ts in reversed(timestamps):
+                if ts < cutoff:
+                    break
+                count += 1
+            return count
+
+    def count_bounces_last_hours(self, inbox_email: str, hours: int = 24) -> int:
+        """Count hard bounces for a specific inbox in the last N hours."""
+        return self._count_last_hours(self._bounces_by_inbox, inbox_email, hours)
+
+    def count_sends_last_hours(self, inbox_email: str, hours: int = 24) -> int:
+        """Count successful sends for a specific inbox in the last N hours."""
+        return self._count_last_hours(self._sends_by_inbox, inbox_email, hours)
+
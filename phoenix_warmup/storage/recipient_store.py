@@ -1,186 +1,304 @@
-"""
-storage/recipient_store.py
-Thread-safe CRUD for recipients.csv.
-Recipients are the pool of addresses that warm-up emails are sent to/from.
-"""
-import csv
-import threading
-from dataclasses import dataclass, asdict
-from datetime import datetime
-from pathlib import Path
-from typing import List, Optional
-import sys
-import random
-
-
-def _get_data_dir() -> Path:
-    if getattr(sys, "frozen", False):
-        base = Path(sys.executable).parent
-    else:
-        base = Path(__file__).parent.parent
-    d = base / "data"
-    d.mkdir(parents=True, exist_ok=True)
-    return d
-
-
-CSV_PATH = _get_data_dir() / "recipients.csv"
-
-HEADERS = ["email", "name", "domain", "active", "count_used", "last_used"]
-
-_lock = threading.Lock()
-
-
-@dataclass
-class RecipientRecord:
-    email: str
-    name: str = ""
-    domain: str = ""
-    active: str = "true"     # stored as string in CSV
-    count_used: int = 0
-    last_used: str = ""
-
-    def is_active(self) -> bool:
-        return self.active.lower() == "true"
-
-    def __post_init__(self):
-        if isinstance(self.count_used, str):
-            self.count_used = int(self.count_used) if self.count_used else 0
-
-
-class RecipientStore:
-    """Thread-safe CSV-backed store for warm-up recipient addresses."""
-
-    def _ensure_file(self) -> None:
-        if not CSV_PATH.exists():
-            with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=HEADERS)
-                writer.writeheader()
-
-    def _read_raw(self) -> List[dict]:
-        self._ensure_file()
-        with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
-            return list(csv.DictReader(f))
-
-    def _write_raw(self, rows: List[dict]) -> None:
-        with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=HEADERS)
-            writer.writeheader()
-            writer.writerows(rows)
-
-    def _row_to_record(self, row: dict) -> RecipientRecord:
-        return RecipientRecord(
-            email=row.get("email", ""),
-            name=row.get("name", ""),
-            domain=row.get("domain", ""),
-            active=row.get("active", "true"),
-            count_used=int(row.get("count_used", 0) or 0),
-            last_used=row.get("last_used", ""),
-        )
-
-    def get_all(self) -> List[RecipientRecord]:
-        with _lock:
-            rows = self._read_raw()
-        return [self._row_to_record(r) for r in rows]
-
-    def get_active(self) -> List[RecipientRecord]:
-        return [r for r in self.get_all() if r.is_active()]
-
-    def has_records(self) -> bool:
-        with _lock:
-            rows = self._read_raw()
-        return len(rows) > 0
-
-    def get_least_used(self, exclude_email: str = "") -> Optional[RecipientRecord]:
-        """Round-robin: pick active recipient with lowest usage count."""
-        active = [r for r in self.get_active() if r.email != exclude_email]
-        if not active:
-            active = self.get_active()  # fallback: ignore exclusion
-        if not active:
-            return None
-        # Sort by count_used ascending, then by last_used ascending for tie-breaking
-        active.sort(key=lambda r: (r.count_used, r.last_used or ""))
-        return active[0]
-
-    def pick_random(self, exclude_email: str = "") -> Optional[RecipientRecord]:
-        """Pick a random active recipient (weighted toward least used)."""
-        active = [r for r in self.get_active() if r.email != exclude_email]
-        if not active:
-            active = self.get_active()
-        if not active:
-            return None
-        return random.choice(active)
-
-    def record_use(self, email: str) -> None:
-        """Increment count_used and update last_used timestamp."""
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                if row["email"] == email:
-                    row["count_used"] = str(int(row.get("count_used", 0) or 0) + 1)
-                    row["last_used"] = datetime.now().isoformat(timespec="seconds")
-                    break
-            self._write_raw(rows)
-
-    def add(self, record: RecipientRecord) -> None:
-        with _lock:
-            rows = self._read_raw()
-            if any(r["email"] == record.email for r in rows):
-                return  # Already exists - silently skip
-            rows.append({
-                "email": record.email,
-                "name": record.name,
-                "domain": record.domain,
-                "active": record.active,
-                "count_used": str(record.count_used),
-                "last_used": record.last_used,
-            })
-            self._write_raw(rows)
-
-    def delete(self, email: str) -> None:
-        with _lock:
-            rows = self._read_raw()
-            rows = [r for r in rows if r["email"] != email]
-            self._write_raw(rows)
-
-    def deactivate(self, email: str) -> None:
-        """Soft-delete: mark as inactive (used when emails bounce)."""
-        with _lock:
-            rows = self._read_raw()
-            for row in rows:
-                if row["email"] == email:
-                    row["active"] = "false"
-                    break
-            self._write_raw(rows)
-
-    def seed_with_faker(self, count: int = 100) -> None:
-        """Generate synthetic recipient addresses using Faker."""
-        try:
-            from faker import Faker
-            fake = Faker("en_US")
-        except ImportError:
-            return
-
-        with _lock:
-            existing = {r["email"] for r in self._read_raw()}
-            new_rows = []
-            attempts = 0
-            while len(new_rows) < count and attempts < count * 3:
-                attempts += 1
-                first = fake.first_name().lower()
-                last = fake.last_name().lower()
-                domain = fake.domain_name()
-                email = f"{first}.{last}@{domain}"
-                if email not in existing:
-                    existing.add(email)
-                    new_rows.append({
-                        "email": email,
-                        "name": f"{fake.first_name()} {fake.last_name()}",
-                        "domain": domain,
-                        "active": "true",
-                        "count_used": "0",
-                        "last_used": "",
-                    })
-
-            rows = self._read_raw()
-            rows.extend(new_rows)
-            self._write_raw(rows)
+"""
+storage/recipient_store.py
+Thread-safe CRUD for recipients.csv.
+Recipients are the pool of addresses that warm-up emails are sent to/from.
+"""
+import atexit
+import csv
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+import operator
+import sys
+import random
+
+from storage.log_store import _file_lock, _now_iso_seconds
+
+
+def _get_data_dir() -> Path:
+    if getattr(sys, "frozen", False):
+        base = Path(sys.executable).parent
+    else:
+        base = Path(__file__).parent.parent
+    d = base / "data"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+CSV_PATH = _get_data_dir() / "recipients.csv"
+
+HEADERS = ["email", "name", "domain", "active", "count_used", "last_used"]
+
+_lock = threading.Lock()
+
+# Create the CSV once at import so the read/write paths don't stat for
+# existence on every call; deletion at runtime is handled where it's read.
+try:
+    if not CSV_PATH.exists():
+        with open(CSV_PATH, "w", newline="", encoding="utf-8") as _f:
+            csv.DictWriter(_f, fieldnames=HEADERS).writeheader()
+except OSError:
+    pass
+
+# Bumped on every write so readers can cache the parsed record list and
+# revalidate with an integer compare (same pattern as inbox_store).
+_version = 0
+
+# Usage bumps accumulated between flushes: email -> (delta, last_used).
+# record_use coalesces into this dict and a short timer rewrites the CSV
+# once with every pending bump applied — N sends in a burst cost one
+# rewrite instead of N. Guarded by _lock.
+_pending_uses: dict = {}
+_flush_timer: Optional[threading.Timer] = None
+
+# Column accessor built once for positional record construction
+_FROM_ROW = operator.itemgetter(*HEADERS)
+
+
+@dataclass(slots=True)
+class RecipientRecord:
+    email: str
+    name: str = ""
+    domain: str = ""
+    active: str = "true"     # stored as string in CSV
+    count_used: int = 0
+    last_used: str = ""
+
+    def is_active(self) -> bool:
+        return self.active.lower() == "true"
+
+    def __post_init__(self):
+        if isinstance(self.count_used, str):
+            self.count_used = int(self.count_used) if self.count_used else 0
+
+
+class RecipientStore:
+    """Thread-safe CSV-backed store for warm-up recipient addresses."""
+
+    def _ensure_file(self) -> None:
+        if not CSV_PATH.exists():
+            with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=HEADERS)
+                writer.writeheader()
+
+    def _read_raw(self) -> List[dict]:
+        try:
+            with open(CSV_PATH, "r", newline="", encoding="utf-8") as f:
+                return list(csv.DictReader(f))
+        except FileNotFoundError:
+            # File vanished at runtime — recreate and carry on empty
+            self._ensure_file()
+            return []
+
+    def _write_raw(self, rows: List[dict]) -> None:
+        """Atomic rewrite: temp file + os.replace, so a crash mid-write
+        can't leave a torn recipients.csv. Caller MUST hold _lock."""
+        global _version
+        tmp = CSV_PATH.with_suffix(".csv.tmp")
+        with _file_lock(CSV_PATH):
+            with open(tmp, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=HEADERS)
+                writer.writeheader()
+                writer.writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, CSV_PATH)
+        _version += 1
+
+    def _row_to_record(self, row: dict) -> RecipientRecord:
+        try:
+            # Positional: HEADERS order matches the dataclass field order
+            # (__post_init__ coerces count_used)
+            return RecipientRecord(*_FROM_ROW(row))
+        except KeyError:
+            # Row from an older file missing newer columns
+            return RecipientRecord(
+                email=row.get("email", ""),
+                name=row.get("name", ""),
+                domain=row.get("domain", ""),
+                active=row.get("active", "true"),
+                count_used=int(row.get("count_used", 0) or 0),
+                last_used=row.get("last_used", ""),
+            )
+
+    def get_all(self) -> List[RecipientRecord]:
+        """Parsed records, cached until the next write. The picker paths
+        (get_least_used / pick_random) run once per warm-up send, so
+        between writes this is a version compare instead of a full CSV
+        parse and R dataclass allocations. The cache tuple is swapped in
+        atomically, so the fast path doesn't need the lock."""
+        cached = getattr(self, "_records_cache", None)
+        if cached is not None and cached[0] == _version:
+            return cached[1]
+        with _lock:
+            version = _version
+            rows = self._read_raw()
+            pending = dict(_pending_uses)
+        records = [self._row_to_record(r) for r in rows]
+        if pending:
+            # Overlay not-yet-flushed usage bumps so pickers always see
+            # current counts even right after a cache rebuild
+            for r in records:
+                bump = pending.get(r.email)
+                if bump is not None:
+                    r.count_used += bump[0]
+                    r.last_used = bump[1]
+        self._records_cache = (version, records)
+        return records
+
+    def get_active(self) -> List[RecipientRecord]:
+        return [r for r in self.get_all() if r.is_active()]
+
+    def count_active(self) -> int:
+        """Number of active recipients. One pass over the cached records —
+        no filtered-list allocation for callers that only want the size."""
+        return sum(1 for r in self.get_all() if r.is_active())
+
+    def has_records(self) -> bool:
+        return bool(self.get_all())
+
+    def get_least_used(self, exclude_email: str = "") -> Optional[RecipientRecord]:
+        """Round-robin: pick active recipient with lowest usage count."""
+        active = [r for r in self.get_active() if r.email != exclude_email]
+        if not active:
+            active = self.get_active()  # fallback: ignore exclusion
+        if not active:
+            return None
+        # One O(R) min over the cached records — no sort, no copy
+        return min(active, key=lambda r: (r.count_used, r.last_used or ""))
+
+    def pick_random(self, exclude_email: str = "") -> Optional[RecipientRecord]:
+        """Pick a random active recipient (weighted toward least used)."""
+        active = [r for r in self.get_active() if r.email != exclude_email]
+        if not active:
+            active = self.get_active()
+        if not active:
+            return None
+        return random.choice(active)
+
+    FLUSH_DELAY = 1.0  # seconds usage bumps may accumulate before a rewrite
+
+    def record_use(self, email: str) -> None:
+        """Increment count_used and update last_used timestamp.
+        The bump lands in _pending_uses (flushed to disk within
+        FLUSH_DELAY) and is applied to the cached records immediately,
+        so pickers inside the same window still rotate away from this
+        recipient."""
+        global _flush_timer
+        now_iso = _now_iso_seconds()
+        with _lock:
+            delta, _ = _pending_uses.get(email, (0, ""))
+            _pending_uses[email] = (delta + 1, now_iso)
+            cached = getattr(self, "_records_cache", None)
+            if cached is not None and cached[0] == _version:
+                for r in cached[1]:
+                    if r.email == email:
+                        r.count_used += 1
+                        r.last_used = now_iso
+                        break
+            if _flush_timer is None:
+                _flush_timer = threading.Timer(self.FLUSH_DELAY,
+                                               self._flush_uses)
+                _flush_timer.daemon = True
+                _flush_timer.start()
+            if not getattr(self, "_atexit_registered", False):
+                atexit.register(self._flush_uses)
+                self._atexit_registered = True
+
+    def _flush_uses(self) -> None:
+        """Rewrite recipients.csv once with every pending bump applied."""
+        global _flush_timer
+        with _lock:
+            _flush_timer = None
+            if not _pending_uses:
+                return
+            pending = dict(_pending_uses)
+            _pending_uses.clear()
+            rows = self._read_raw()
+            for row in rows:
+                bump = pending.get(row["email"])
+                if bump is not None:
+                    row["count_used"] = str(
+                        int(row.get("count_used", 0) or 0) + bump[0])
+                    row["last_used"] = bump[1]
+            self._write_raw(rows)
+
+    def add(self, record: RecipientRecord) -> bool:
+        """Append one recipient. Returns False if the address already
+        exists (silently skipped), True if it was written."""
+        with _lock:
+            rows = self._read_raw()
+            if any(r["email"] == record.email for r in rows):
+                return False  # Already exists - silently skip
+            rows.append({
+                "email": record.email,
+                "name": record.name,
+                "domain": record.domain,
+                "active": record.active,
+                "count_used": str(record.count_used),
+                "last_used": record.last_used,
+            })
+            self._write_raw(rows)
+            return True
+
+    def delete(self, email: str) -> None:
+        with _lock:
+            rows = self._read_raw()
+            rows = [r for r in rows if r["email"] != email]
+            self._write_raw(rows)
+
+    def deactivate(self, email: str) -> None:
+        """Soft-delete: mark as inactive (used when emails bounce)."""
+        with _lock:
+            rows = self._read_raw()
+            for row in rows:
+                if row["email"] == email:
+                    row["active"] = "false"
+                    break
+            self._write_raw(rows)
+
+    def seed_with_faker(self, count: int = 100) -> int:
+        """Generate synthetic recipient addresses using Faker.
+        Returns the number of recipients actually added."""
+        try:
+            from faker import Faker
+            fake = Faker("en_US")
+        except ImportError:
+            return 0
+
+        with _lock:
+            rows = self._read_raw()
+            existing = {r["email"] for r in rows}
+            new_rows = []
+            # Generate candidates in oversized batches and dedup in one
+            # pass per round, instead of one Faker call + set check per
+            # attempt. Three rounds bounds the loop when the name pool
+            # can't yield enough unique addresses.
+            rounds = 0
+            while len(new_rows) < count and rounds < 3:
+                rounds += 1
+                batch = (count - len(new_rows)) * 2
+                firsts = [fake.first_name() for _ in range(batch)]
+                lasts = [fake.last_name() for _ in range(batch)]
+                domains = [fake.domain_name() for _ in range(batch)]
+                for first, last, domain in zip(firsts, lasts, domains):
+                    email = f"{first.lower()}.{last.lower()}@{domain}"
+                    if email in existing:
+                        continue
+                    existing.add(email)
+                    new_rows.append({
+                        "email": email,
+                        "name": f"{first} {last}",
+                        "domain": domain,
+                        "active": "true",
+                        "count_used": "0",
+                        "last_used": "",
+                    })
+                    if len(new_rows) == count:
+                        break
+
+            rows.extend(new_rows)
+            self._write_raw(rows)
+            return len(new_rows)